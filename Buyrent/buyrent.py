@@ -1,53 +1,205 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import argparse
 import time
-import random
+import asyncio
+import aiohttp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.engine import HttpFetcher, SiteAdapter, finalize_records, run_adapter, save_records, save_replay
+from Common.dedupe import Deduper, DedupingSink
+from Common.http_cache import CACHE_RESPONSES, response_cache
+from Common.metrics import metrics
+from Common.rate_limit import MAX_RETRIES, MIN_RATE, THROTTLE_STATUSES, host_rates
+from Common.sinks import open_sink
 
 # Set headers to mimic a browser visit
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
-def scrape_property_listings(url, max_pages=5):
+# Async engine settings
+CONCURRENCY = 8  # Pages in flight at once over the pooled connection
+RATE_PER_SECOND = 4.0  # Ceiling of the adaptive request rate; it backs off on 429/503 or slow responses
+BURST = 4  # Requests allowed back-to-back before the rate applies
+PARSE_WORKERS = 4  # Processes parsing HTML off the event loop
+REQUEST_TIMEOUT = 30
+
+def page_url_for(url, page):
+    return f"{url}?page={page}" if page > 1 else url
+
+def parse_listings(html):
+    """Parse every listing card on a results page"""
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(html, 'html.parser')
+    return extract_listings(soup)
+
+def parse_listings_timed(html):
+    """parse_listings for a pool process, returning (properties, parse seconds, extract seconds)"""
+    # Metrics recorded in the worker process never reach the run report, so the timings go back with the records
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, 'html.parser')
+    parsed = time.perf_counter()
+    properties = extract_listings(soup)
+    return properties, parsed - start, time.perf_counter() - parsed
+
+def extract_listings(soup):
+    """Records of every listing card in a parsed results page"""
     properties = []
+    listings = soup.find_all('div', class_='listing-card')
     
-    for page in range(1, max_pages + 1):
-        print(f"Scraping page {page}...")
-        page_url = f"{url}?page={page}" if page > 1 else url
-        response = requests.get(page_url, headers=headers)
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch page {page}. Status code: {response.status_code}")
+    for listing in listings:
+        try:
+            property_info = {
+                'title': extract_title(listing),
+                'price': extract_price(listing),
+                'location': extract_location(listing),
+                'description': extract_description(listing),
+                'features': extract_features(listing),
+                'property_type': extract_property_type(listing),
+                'bedrooms': extract_bedrooms(listing),
+                'bathrooms': extract_bathrooms(listing),
+                'url': extract_url(listing),
+                'agency': extract_agency(listing)
+            }
+            properties.append(property_info)
+        except Exception as e:
+            print(f"Error processing a listing: {e}")
             continue
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        listings = soup.find_all('div', class_='listing-card')
-        
-        for listing in listings:
-            try:
-                property_info = {
-                    'title': extract_title(listing),
-                    'price': extract_price(listing),
-                    'location': extract_location(listing),
-                    'description': extract_description(listing),
-                    'features': extract_features(listing),
-                    'property_type': extract_property_type(listing),
-                    'bedrooms': extract_bedrooms(listing),
-                    'bathrooms': extract_bathrooms(listing),
-                    'url': extract_url(listing),
-                    'agency': extract_agency(listing)
-                }
-                properties.append(property_info)
-            except Exception as e:
-                print(f"Error processing a listing: {e}")
-                continue
-        
-        # Random delay to avoid overwhelming the server
-        time.sleep(random.uniform(1, 3))
     
     return properties
 
+class BuyrentAdapter(SiteAdapter):
+    name = "BuyRentKenya"
+    listing_selector = "div.listing-card"
+    rate_limits = (MIN_RATE, RATE_PER_SECOND)  # Requests/s per host; the limiter adapts between these
+    output_file = "buyrentkenya_properties.csv"
+    source = "buyrent"
+    dtypes = dict.fromkeys(["title", "price", "location", "description", "features", "property_type",
+                            "bedrooms", "bathrooms", "url", "agency"], "string")
+    price_history = {"id_column": "url", "price_column": "price", "name_column": "title", "url_column": "url"}
+    dedupe_fields = ("url",)
+
+    def __init__(self, url, max_pages=5):
+        self.url = url
+        self.max_pages = max_pages
+
+    def create_fetcher(self):
+        return HttpFetcher(headers)
+
+    def start_urls(self):
+        return [("Listings", self.url)]
+
+    def page_url(self, url, page):
+        return page_url_for(url, page)
+
+    def extract_records(self, html, group, page_url):
+        return parse_listings(html)
+
+    def to_frame(self, records):
+        # Convert features list to string for CSV
+        df = pd.DataFrame(records)
+        df['features'] = df['features'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
+        return df
+
+def scrape_property_listings(url, max_pages=5):
+    return run_adapter(BuyrentAdapter(url, max_pages))
+
+THROTTLED = object()  # request_page's answer when the page may be fetched again
+
+async def fetch_page(session, semaphore, url, page):
+    page_url = page_url_for(url, page)
+    async with semaphore:
+        # A 429/503 is sent again once the limiter's pause (Retry-After or backoff) has passed
+        for attempt in range(MAX_RETRIES + 1):
+            body = await request_page(session, page_url, page, attempt)
+            if body is not THROTTLED:
+                return body
+        return None
+
+async def request_page(session, page_url, page, attempt):
+    await host_rates.acquire(page_url)
+    requested = time.monotonic()
+    try:
+        async with session.get(page_url) as response:
+            host_rates.feedback(page_url, response.status, time.monotonic() - requested,
+                                response.headers.get("Retry-After"))
+            if response.status in THROTTLE_STATUSES and attempt < MAX_RETRIES:
+                print(f"Page {page} answered {response.status} - retry {attempt + 1}/{MAX_RETRIES}")
+                return THROTTLED
+            if response.status != 200:
+                print(f"Failed to fetch page {page}. Status code: {response.status}")
+                return None
+            print(f"Fetched page {page}")
+            body = await response.read()
+            # Timed by hand: stage() nests per thread, and the pages share the event loop's thread
+            metrics.observe("navigation", time.monotonic() - requested)
+            metrics.count(bytes=len(body))
+            if CACHE_RESPONSES:
+                stored = time.monotonic()
+                response_cache.put(page_url, body, response.status, response.headers,
+                                   BuyrentAdapter.source, "Listings", page)
+                metrics.observe("cache", time.monotonic() - stored)
+            return body
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        # Counted as a slow response so the pace eases off
+        host_rates.feedback(page_url, latency=time.monotonic() - requested)
+        print(f"Failed to fetch page {page}: {e}")
+        return None
+
+async def scrape_pages_async(url, max_pages, concurrency, rate, burst, parse_workers, sink=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    host_rates.configure(url, MIN_RATE, rate, burst=burst)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    loop = asyncio.get_running_loop()
+    metrics.start(BuyrentAdapter.name)
+    parsed = {}  # Pages parsed while an earlier page is still in flight
+    next_to_write = 1
+
+    def flush():
+        nonlocal next_to_write
+        while next_to_write in parsed:
+            started = time.monotonic()
+            sink.write(parsed.pop(next_to_write))
+            metrics.observe("write", time.monotonic() - started)
+            next_to_write += 1
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        async def fetch_and_parse(page):
+            html = await fetch_page(session, semaphore, url, page)
+            page_properties = []
+            if html is not None:
+                page_properties, parse_seconds, extract_seconds = await loop.run_in_executor(
+                    pool, parse_listings_timed, html)
+                metrics.observe("parse", parse_seconds)
+                metrics.observe("extract", extract_seconds)
+                metrics.count(pages=1, records=len(page_properties))
+            if sink is None:
+                return page_properties
+            # Written once every earlier page is, so the sink (and its dedupe) sees page order
+            parsed[page] = page_properties
+            flush()
+            return []
+
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
+            pages = await asyncio.gather(*(fetch_and_parse(page) for page in range(1, max_pages + 1)))
+
+    host_rates.summary()
+    metrics.export()
+    # gather keeps page order, so the output matches the sequential scraper
+    return [prop for page_properties in pages for prop in page_properties]
+
+def scrape_property_listings_async(url, max_pages=5, concurrency=CONCURRENCY, rate=RATE_PER_SECOND,
+                                   burst=BURST, parse_workers=PARSE_WORKERS, sink=None):
+    """Drop-in replacement for scrape_property_listings that fetches pages concurrently.
+    With a sink, each page is written as soon as it and every earlier page are parsed,
+    in page order, and an empty list is returned."""
+    return asyncio.run(scrape_pages_async(url, max_pages, concurrency, rate, burst, parse_workers, sink))
+
 def extract_title(listing):
     # Try both mobile and desktop title selectors
     title = listing.find('span', class_='text-lg font-semibold leading-6 text-black md:inline')
@@ -125,13 +277,19 @@ def extract_agency(listing):
     return "N/A"
 
 def save_to_csv(properties, filename='buyrentkenya_properties.csv'):
-    # Convert features list to string for CSV
-    df = pd.DataFrame(properties)
-    df['features'] = df['features'].apply(lambda x: ', '.join(x) if isinstance(x, list) else x)
-    df.to_csv(filename, index=False)
-    print(f"Data saved to {filename}")
+    save_records(BuyrentAdapter(None), properties, filename)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape BuyRentKenya rental listings")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-parse listings from the page cache instead of the website")
+    args = parser.parse_args()
+
     url = "https://www.buyrentkenya.com/property-for-rent"
-    properties = scrape_property_listings(url, max_pages=3)  # Scrape 3 pages for demo
-    save_to_csv(properties)
\ No newline at end of file
+    adapter = BuyrentAdapter(url, max_pages=3)  # Scrape 3 pages for demo
+    if args.replay:
+        save_replay(adapter)
+    else:
+        sink = DedupingSink(open_sink(adapter.output_file), Deduper.for_adapter(adapter))
+        scrape_property_listings_async(url, max_pages=adapter.max_pages, sink=sink)
+        finalize_records(adapter, sink)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from Common.dedupe import Deduper
+from Common.history import parse_prices, stable_ids
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# ======================
+# CONFIGURATION
+# ======================
+PAGE_INDEX_FILE = "Data Store/page_index.sqlite"  # Fingerprint and records of every page from the last full scrape
+DELTA_STAGE = "delta"  # Parquet stage holding each change-detection run's new/removed/repriced items
+
+# textContent of every listing card, read in the browser so the page source is never transferred
+LISTING_TEXTS_JS = """
+return Array.from(document.querySelectorAll(arguments[0]), card => card.textContent);
+"""
+
+
+def listing_texts(html, selector):
+    """Text of every element matching selector in an HTML page"""
+    if not html:
+        return []
+    if LexborHTMLParser is not None:
+        return [card.text(deep=True) for card in LexborHTMLParser(html).css(selector)]
+    return [card.get_text() for card in BeautifulSoup(html, "html.parser").select(selector)]
+
+
+def listing_fingerprint(texts):
+    """Hash of the listing cards' whitespace-normalized text, or None when there are no cards"""
+    if not texts:
+        return None
+    block = "\n".join(" ".join(text.split()) for text in texts)
+    return hashlib.sha1(block.encode("utf-8")).hexdigest()
+
+
+def diff_records(previous, current, source, id_column, price_column):
+    """New, removed and repriced items between two lists of records of the same source"""
+    def keyed(records):
+        df = pd.DataFrame(records)
+        if df.empty or id_column not in df:
+            return pd.DataFrame(columns=[id_column, price_column])
+        df.index = stable_ids(source, df[id_column]).to_numpy()
+        return df[df.index.notna() & ~df.index.duplicated()]
+
+    before, after = keyed(previous), keyed(current)
+    new = after.loc[after.index.difference(before.index)].assign(change="new")
+    removed = before.loc[before.index.difference(after.index)].assign(change="removed")
+
+    common = after.index.intersection(before.index)
+    old_prices = parse_prices(before.loc[common, price_column])
+    new_prices = parse_prices(after.loc[common, price_column])
+    changed = common[~((old_prices == new_prices) | (old_prices.isna() & new_prices.isna())).to_numpy()]
+    repriced = after.loc[changed].assign(change="repriced", previous_price=before.loc[changed, price_column].to_numpy())
+
+    delta = pd.concat([new, removed, repriced])
+    delta.index.name = "item_id"
+    return delta.reset_index()
+
+
+class ChangeTracker:
+    """Skips unchanged pages and collects the delta feed of a change-detection run.
+
+    The page index keeps, per group and page, a fingerprint of the listing
+    block and the records extracted from it on the last run. A page whose
+    fingerprint is unchanged is neither extracted nor written; its stored
+    records stand in for it. Once a group has been paginated to its end its
+    index rows are replaced. The items of every finished group are compared
+    with the last run together, by stable ID and after dropping repeats the
+    way the run's DedupingSink does, so items moving between pages or groups
+    are not reported as changes. Groups that do not finish leave the index
+    untouched. Finished groups' items are kept in the index until the delta
+    feed is stored (see clear), so a resumed run still reports the groups its
+    interrupted start finished.
+    """
+
+    def __init__(self, source, id_column, price_column, path=PAGE_INDEX_FILE, dedupe_fields=None, resume=False):
+        self.source = source
+        self.id_column = id_column
+        self.price_column = price_column
+        self.dedupe_fields = dedupe_fields
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "source TEXT NOT NULL, grp TEXT NOT NULL, page INTEGER NOT NULL, fingerprint TEXT, records TEXT NOT NULL, "
+            "PRIMARY KEY (source, grp, page))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS finished ("
+            "source TEXT NOT NULL, grp TEXT NOT NULL, previous TEXT NOT NULL, current TEXT NOT NULL, "
+            "PRIMARY KEY (source, grp))"
+        )
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self.pending = {}
+        self.finished = {}  # group -> (last run's records, this run's records)
+        if resume:
+            rows = self.conn.execute("SELECT grp, previous, current FROM finished WHERE source = ?",
+                                     (source,)).fetchall()
+            self.finished = {group: (json.loads(previous), json.loads(current)) for group, previous, current in rows}
+        else:
+            self.clear()
+        self.skipped = 0
+        self.extracted = 0
+
+    @classmethod
+    def for_adapter(cls, adapter, path=PAGE_INDEX_FILE, resume=False):
+        """Tracker keyed on the adapter's price_history id and price columns"""
+        columns = adapter.price_history or {}
+        if "id_column" not in columns or "price_column" not in columns:
+            raise ValueError(f"{adapter.name} has no item ID and price columns for change detection")
+        return cls(adapter.source or adapter.name, columns["id_column"], columns["price_column"], path,
+                   adapter.dedupe_fields, resume)
+
+    def _stored(self, group):
+        with self._lock:
+            rows = self.conn.execute("SELECT page, fingerprint, records FROM pages WHERE source = ? AND grp = ?",
+                                     (self.source, group)).fetchall()
+        return {page: (fingerprint, json.loads(records)) for page, fingerprint, records in rows}
+
+    def unchanged(self, group, page, fingerprint):
+        """True (and the page counted as seen) when it matches the last run's page"""
+        if fingerprint is None:
+            return False
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT records FROM pages WHERE source = ? AND grp = ? AND page = ? AND fingerprint = ?",
+                (self.source, group, page, fingerprint)).fetchone()
+            if row is None:
+                return False
+            self.pending.setdefault(group, {})[page] = (fingerprint, json.loads(row[0]))
+            self.skipped += 1
+        return True
+
+    def page_extracted(self, group, page, fingerprint, records):
+        with self._lock:
+            self.pending.setdefault(group, {})[page] = (fingerprint, records)
+            self.extracted += 1
+
+    def finish_group(self, group):
+        """Replace the group's index rows and keep its items for the delta feed (see delta_frame)"""
+        stored = self._stored(group)
+        with self._lock:
+            pages = self.pending.pop(group, {})
+        if pages:
+            # A resumed group only revisited pages from where it stopped
+            first = min(pages)
+            pages = {**{page: entry for page, entry in stored.items() if page < first}, **pages}
+
+        previous = [record for _, records in stored.values() for record in records]
+        current = [record for _, records in pages.values() for record in records]
+
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM pages WHERE source = ? AND grp = ?", (self.source, group))
+                self.conn.executemany(
+                    "INSERT INTO pages (source, grp, page, fingerprint, records) VALUES (?, ?, ?, ?, ?)",
+                    [(self.source, group, page, fingerprint, json.dumps(records, ensure_ascii=False, default=str))
+                     for page, (fingerprint, records) in pages.items()])
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO finished (source, grp, previous, current) VALUES (?, ?, ?, ?)",
+                    (self.source, group, json.dumps(previous, ensure_ascii=False, default=str),
+                     json.dumps(current, ensure_ascii=False, default=str)))
+            self.finished[group] = (previous, current)
+        print(f"   🔁 [{group}] {len(current)} items indexed, {len(previous)} on the last run")
+
+    def _deduped(self, batches):
+        if not self.dedupe_fields:
+            return [record for batch in batches for record in batch]
+        deduper = Deduper(self.source, self.dedupe_fields)
+        return [record for batch in batches for record in deduper.filter(batch)]
+
+    def delta_frame(self, groups=()):
+        """New, removed and repriced items across every finished group.
+
+        Groups are taken in the order given (the run's scrape order, then any
+        others), so an item listed in several groups keeps the same copy a
+        normal run would.
+        """
+        with self._lock:
+            finished = dict(self.finished)
+        order = [group for group in groups if group in finished]
+        order += [group for group in finished if group not in order]
+        previous = self._deduped([finished[group][0] for group in order])
+        current = self._deduped([finished[group][1] for group in order])
+        delta = diff_records(previous, current, self.source, self.id_column, self.price_column)
+        if delta.empty:
+            return pd.DataFrame(columns=["item_id", "change"])
+        return delta
+
+    def clear(self):
+        """Forget the finished groups once their delta feed is stored"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM finished WHERE source = ?", (self.source,))
+            self.finished = {}
+
+    def close(self):
+        self.conn.close()
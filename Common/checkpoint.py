@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+# ======================
+# CONFIGURATION
+# ======================
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def checkpoint_path(output_file):
+    """Where progress towards output_file is recorded"""
+    base, _ = os.path.splitext(output_file)
+    return base + CHECKPOINT_SUFFIX
+
+
+class CheckpointStore:
+    """Last completed page and record count per group, kept in a small JSON file.
+
+    The file is rewritten after every page so a rerun can pick up where a
+    failed run stopped. Progress only counts while the staging file the
+    records were streamed to still exists; otherwise the run starts over.
+    """
+
+    def __init__(self, path, staging_path=None):
+        self.path = path
+        self.staging_path = staging_path
+        self.groups = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    saved = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable checkpoint {path}: {str(e)}")
+                saved = {}
+            if saved.get("staging") == staging_path and (staging_path is None or os.path.exists(staging_path)):
+                self.groups = saved.get("groups", {})
+            elif saved:
+                print(f"⚠️ Checkpoint {path} does not match {staging_path} - starting over")
+
+    @property
+    def resuming(self):
+        return bool(self.groups)
+
+    def start_page(self, group):
+        """First page still to scrape for a group, or None once it is finished"""
+        state = self.groups.get(group)
+        if state is None:
+            return 1
+        if state.get("done"):
+            return None
+        return state["last_page"] + 1
+
+    def records(self, group):
+        return self.groups.get(group, {}).get("records", 0)
+
+    def page_done(self, group, page, records):
+        with self._lock:
+            state = self.groups.setdefault(group, {"last_page": 0, "records": 0, "done": False})
+            state["last_page"] = page
+            state["records"] += records
+            self._save()
+
+    def group_done(self, group):
+        with self._lock:
+            state = self.groups.setdefault(group, {"last_page": 0, "records": 0, "done": False})
+            state["done"] = True
+            self._save()
+
+    def is_complete(self, groups):
+        return all(self.groups.get(group, {}).get("done") for group in groups)
+
+    def reset(self):
+        with self._lock:
+            self.groups = {}
+            self._save()
+
+    def clear(self):
+        """Forget the run once its output has been written"""
+        with self._lock:
+            self.groups = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            "staging": self.staging_path,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "groups": self.groups,
+        }
+        # Write then rename so a crash mid-write never leaves a truncated file
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
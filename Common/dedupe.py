@@ -0,0 +1,131 @@
+import hashlib
+import math
+import threading
+from collections import Counter
+
+# ======================
+# CONFIGURATION
+# ======================
+DEDUPE_BACKEND = "set"  # "set" (exact) or "bloom" (fixed memory, for very large crawls)
+BLOOM_CAPACITY = 10_000_000  # Records the Bloom filter is sized for
+BLOOM_ERROR_RATE = 0.0001  # Chance a new record is mistaken for a duplicate at capacity
+MISSING_VALUES = {"", "n/a", "none", "nan"}
+
+
+def identity_key(record, fields):
+    """Normalized identity of a record from the given fields, or None when all of them are missing"""
+    values = [" ".join(str(record.get(field) or "").lower().split()) for field in fields]
+    if all(value in MISSING_VALUES for value in values):
+        return None
+    return "|".join(values)
+
+
+def _digest(key):
+    # 64-bit hash; a set of ints is several times smaller than a set of the keys
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SeenSet:
+    """Exact membership on 64-bit hashes of the identity keys"""
+
+    def __init__(self):
+        self.seen = set()
+
+    def add(self, digest):
+        """True if digest had not been seen before"""
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
+
+
+class BloomFilter:
+    """Fixed-size bit array; never misses a duplicate, rarely drops a new record"""
+
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, digest):
+        """True if digest was not (probably) in the filter before"""
+        # Double hashing: k positions from the two 32-bit halves of the digest
+        first, second = digest >> 32, (digest & 0xFFFFFFFF) | 1
+        new = False
+        for i in range(self.hashes):
+            position = (first + i * second) % self.size
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        return new
+
+
+BACKENDS = {
+    "set": SeenSet,
+    "bloom": BloomFilter,
+}
+
+
+class Deduper:
+    """Drops records whose identity was already seen during a run, counting drops per group"""
+
+    def __init__(self, name, fields, group_field=None, backend=DEDUPE_BACKEND):
+        self.name = name
+        self.fields = tuple(fields)
+        self.group_field = group_field
+        self.seen = BACKENDS[backend]()
+        self.kept = 0
+        self.duplicates = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_adapter(cls, adapter, backend=DEDUPE_BACKEND):
+        return cls(adapter.name, adapter.dedupe_fields, adapter.group_field, backend)
+
+    def filter(self, records):
+        """Records not seen before; records without an identity are always kept"""
+        kept = []
+        with self._lock:
+            for record in records:
+                key = identity_key(record, self.fields)
+                if key is None or self.seen.add(_digest(key)):
+                    kept.append(record)
+                else:
+                    self.duplicates[record.get(self.group_field) if self.group_field else None] += 1
+            self.kept += len(kept)
+        return kept
+
+    def prime(self, records):
+        """Mark records written by an earlier, resumed part of the run as seen"""
+        with self._lock:
+            for record in records:
+                key = identity_key(record, self.fields)
+                if key is not None:
+                    self.seen.add(_digest(key))
+            self.kept += len(records)
+
+    def report(self):
+        dropped = sum(self.duplicates.values())
+        if not dropped:
+            print(f"🧹 {self.name}: no duplicate records")
+            return
+        share = dropped / (dropped + self.kept) * 100
+        print(f"🧹 {self.name}: dropped {dropped} duplicate records ({share:.1f}% of {dropped + self.kept})")
+        for group, count in self.duplicates.most_common():
+            if group is not None:
+                print(f"   - {group}: {count}")
+
+
+class DedupingSink:
+    """Wraps a record sink so only records with a new identity reach it"""
+
+    def __init__(self, sink, deduper):
+        self.sink = sink
+        self.deduper = deduper
+
+    def write(self, records):
+        return self.sink.write(self.deduper.filter(records))
+
+    def __getattr__(self, name):
+        return getattr(self.sink, name)
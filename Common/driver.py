@@ -0,0 +1,125 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+from Common.readiness import install_readiness_hooks
+
+# ======================
+# CONFIGURATION
+# ======================
+HEADLESS = True  # Set to False to watch the browser while debugging
+BLOCK_RESOURCES = True  # Skip images, fonts, media and analytics beacons
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+WINDOW_SIZE = "1920,1080"
+
+# Passed to CDP Network.setBlockedURLs; '*' is a wildcard
+BLOCKED_URLS = [
+    # Analytics and tracking beacons
+    "*bam.nr-data.net*",
+    "*js-agent.newrelic.com*",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*analytics.tiktok.com*",
+    "*hotjar.com*",
+    "*smartlook.com*",
+    "*go-mpulse.net*",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8",
+    # Images that slip past the content setting (CSS backgrounds, preloads)
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico",
+]
+
+HIDE_WEBDRIVER_JS = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
+"""
+
+# Sums bytes fetched since the last call: the document itself the first time
+# it is measured, then every resource entry, which is cleared afterwards.
+# Cached responses report a transferSize of 0.
+TRANSFER_BYTES_JS = """
+let total = 0;
+if (!window.__scraperNavCounted) {
+    window.__scraperNavCounted = true;
+    for (const entry of performance.getEntriesByType('navigation')) total += entry.transferSize || 0;
+}
+for (const entry of performance.getEntriesByType('resource')) total += entry.transferSize || 0;
+performance.clearResourceTimings();
+return total;
+"""
+
+# HTTP status of the current document (Chrome 109+); null where it is not exposed
+NAVIGATION_STATUS_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav && nav.responseStatus ? nav.responseStatus : null;
+"""
+
+RESOURCE_BUFFER_JS = """
+performance.setResourceTimingBufferSize(5000);
+"""
+
+
+def setup_driver(headless=HEADLESS, block_resources=BLOCK_RESOURCES, user_agent=USER_AGENT, service=None):
+    """Chrome driver with a lean, cache-friendly profile shared by every scraper"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={WINDOW_SIZE}")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--disable-popup-blocking")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"user-agent={user_agent}")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    if block_resources:
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+        })
+
+    if service is not None:
+        driver = webdriver.Chrome(service=service, options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+
+    # Keep the HTTP cache on so static assets are reused across pages
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+    if block_resources:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": HIDE_WEBDRIVER_JS})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_BUFFER_JS})
+    install_readiness_hooks(driver)
+    return driver
+
+
+def page_transfer_bytes(driver):
+    """Bytes transferred over the network since the previous call on this page"""
+    try:
+        return driver.execute_script(TRANSFER_BYTES_JS) or 0
+    except WebDriverException:
+        return 0
+
+
+def navigation_status(driver):
+    """HTTP status of the page the driver is on, or None when unknown"""
+    try:
+        return driver.execute_script(NAVIGATION_STATUS_JS)
+    except WebDriverException:
+        return None
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
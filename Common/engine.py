@@ -0,0 +1,663 @@
+import collections
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+
+from Common.driver import format_bytes, navigation_status, page_transfer_bytes, setup_driver
+from Common.readiness import readiness_report, wait_until_ready
+from Common.changes import DELTA_STAGE, LISTING_TEXTS_JS, listing_fingerprint, listing_texts
+from Common.dedupe import Deduper, DedupingSink
+from Common.history import record_prices
+from Common.http_cache import CACHE_RESPONSES, LISTING_HTML_JS, response_cache
+from Common.metrics import metrics
+from Common.rate_limit import MAX_RATE, MAX_RETRIES, MIN_RATE, THROTTLE_STATUSES, host_rates
+from Common.checkpoint import CheckpointStore, checkpoint_path
+from Common.sinks import SINK_FORMAT, SINKS, MemorySink, finalize, staging_path
+from Common.storage import export_report, write_stage
+
+# ======================
+# CONFIGURATION
+# ======================
+MAX_SESSIONS_PER_HOST = 3  # Cap on sessions scraping the same host at once
+RUNS_DIR = "Data Store/runs"  # Staging files and checkpoints of adapters with a run_id
+REQUEST_TIMEOUT = 30
+
+
+# ======================
+# FETCHERS
+# ======================
+def succeeded(status):
+    """Whether a response can be extracted (status None when the fetcher cannot tell)"""
+    return status is None or 200 <= status < 300
+
+
+def _send(fetcher, url, request):
+    """Request url, sending the same request again while the host answers 429/503.
+
+    Each retry waits for the pause the rate limiter sets from the response
+    (Retry-After when given, the backed-off rate otherwise), and gives up
+    after MAX_RETRIES; the caller sees the last response either way.
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        requested = time.monotonic()
+        request(url)
+        status, retry_after = fetcher.last_response()
+        if status not in THROTTLE_STATUSES:
+            return
+        host_rates.feedback(url, status, time.monotonic() - requested, retry_after)
+        print(f"   ⏳ {url} answered {status} - retry {attempt}/{MAX_RETRIES}")
+        host_rates.wait(url)
+    request(url)
+
+
+class BrowserFetcher:
+    """Loads pages in a Selenium-driven Chrome"""
+
+    def __init__(self, driver=None):
+        self.driver = driver or setup_driver()
+
+    def get(self, url):
+        _send(self, url, self.driver.get)
+
+    def wait_ready(self, selector=None, previous_signature=None, baseline=0, label="page"):
+        return wait_until_ready(self.driver, selector, previous_signature, baseline=baseline, label=label)
+
+    def html(self):
+        with metrics.stage("transfer"):
+            html = self.driver.page_source
+        metrics.count(page_source_chars=len(html))
+        return html
+
+    def listing_texts(self, selector):
+        return self.driver.execute_script(LISTING_TEXTS_JS, selector)
+
+    def listing_html(self, selector):
+        """The listing cards alone, without serializing the rest of the page"""
+        with metrics.stage("transfer"):
+            html = self.driver.execute_script(LISTING_HTML_JS, selector)
+        metrics.count(page_source_chars=len(html))
+        return html
+
+    def last_response(self):
+        """(HTTP status, Retry-After) of the current document, as far as the browser exposes it"""
+        return navigation_status(self.driver), None
+
+    def response_headers(self):
+        return {}
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+    def transfer_bytes(self):
+        return page_transfer_bytes(self.driver)
+
+    def close(self):
+        self.driver.quit()
+
+
+class HttpFetcher:
+    """Loads pages over a keep-alive requests session"""
+
+    def __init__(self, headers=None, session=None):
+        self.session = session or requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+        self.response = None
+
+    def get(self, url):
+        _send(self, url, self._request)
+        if not succeeded(self.response.status_code):
+            print(f"Failed to fetch {url}. Status code: {self.response.status_code}")
+
+    def _request(self, url):
+        self.response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+
+    def wait_ready(self, selector=None, previous_signature=None, baseline=0, label="page"):
+        return None
+
+    def html(self):
+        if self.response is None or not succeeded(self.response.status_code):
+            return ""
+        return self.response.text
+
+    def listing_texts(self, selector):
+        return listing_texts(self.html(), selector)
+
+    def listing_html(self, selector):
+        # The whole page has been downloaded already
+        return self.html()
+
+    def last_response(self):
+        """(HTTP status, Retry-After) of the last request"""
+        if self.response is None:
+            return None, None
+        return self.response.status_code, self.response.headers.get("Retry-After")
+
+    def response_headers(self):
+        return dict(self.response.headers) if self.response is not None else {}
+
+    @property
+    def current_url(self):
+        return self.response.url if self.response is not None else None
+
+    def transfer_bytes(self):
+        return len(self.response.content) if self.response is not None else 0
+
+    def close(self):
+        self.session.close()
+
+
+# ======================
+# SITE ADAPTER
+# ======================
+class SiteAdapter:
+    """Describes one site; the engine supplies fetching, pacing, concurrency and export.
+
+    Subclasses provide the start URLs, how to reach the next page and how to
+    turn a page into records. Hooks that a site does not need keep their
+    defaults.
+    """
+
+    name = "site"
+    listing_selector = None  # CSS selector for one listing card
+    max_pages = 1
+    rate_limits = (MIN_RATE, MAX_RATE)  # Floor and ceiling of the adaptive request rate per host, in requests/s
+    output_file = None  # Optional .xlsx/.csv report
+    run_id = None  # Date-free name for the staging file and checkpoint when output_file is dated
+    group_field = None  # Record field holding the group, used to restore start_urls order
+    source = None  # Name of the site in the Parquet store
+    dtypes = None  # Explicit column dtypes for the stored raw stage
+    price_history = None  # record_prices column arguments (id_column, price_column, ...); None skips the history
+    dedupe_fields = None  # Record fields identifying an item; repeats within a run are dropped
+    last_groups = ()  # Groups started only once every other group has finished, so their repeats are dropped
+    date_field = None  # Record field holding the day a record was scraped; replay fills it with the fetch date
+    replayed_on = None  # Day the latest replayed page was fetched, set by replay_adapter
+
+    def create_fetcher(self):
+        return BrowserFetcher()
+
+    def start_urls(self):
+        """(group, url) pairs; each group is paginated separately"""
+        return []
+
+    def prepare(self, fetcher):
+        """One-off session setup such as store selection; False aborts the session"""
+        return True
+
+    def open_group(self, fetcher, group, url):
+        fetcher.get(url)
+
+    def page_url(self, url, page):
+        """URL of a given page for URL-addressable pagination, None otherwise"""
+        return url if page == 1 else None
+
+    def next_page(self, fetcher, group, url, page):
+        """Move the fetcher from `page` to the following page; False when there is none"""
+        next_url = self.page_url(url, page + 1)
+        if next_url is None:
+            return False
+        fetcher.get(next_url)
+        return True
+
+    def resume_page(self, fetcher, group, url, page):
+        """Move a freshly opened group straight to `page` when resuming a run.
+
+        Loads the page URL when there is one, otherwise steps through the
+        earlier pages without extracting them. False if `page` is out of reach.
+        """
+        direct_url = self.page_url(url, page)
+        if direct_url is not None:
+            fetcher.get(direct_url)
+            return True
+        for skipped in range(1, page):
+            fetcher.wait_ready(self.listing_selector)
+            if not self.next_page(fetcher, group, url, skipped):
+                return False
+        return True
+
+    def extract_records(self, html, group, page_url):
+        """Records found in a page's HTML"""
+        raise NotImplementedError
+
+    def extract_page(self, fetcher, group, html=None):
+        """Records on the fetcher's current page; override to read the live DOM instead.
+
+        html is the page_html already read for the response cache, if any, so
+        the page is only transferred from the fetcher once.
+        """
+        return self.extract_records(fetcher.html() if html is None else html, group, fetcher.current_url)
+
+    def page_html(self, fetcher):
+        """HTML of the current page for the response cache; sites reading the live DOM cache only their cards"""
+        return fetcher.html()
+
+    def page_fingerprint(self, fetcher):
+        """Hash of the current page's listing block, compared across runs in change-detection mode"""
+        return listing_fingerprint(fetcher.listing_texts(self.listing_selector)) if self.listing_selector else None
+
+    def to_frame(self, records):
+        """DataFrame that is stored and reported; override for site-specific cleanup"""
+        return pd.DataFrame(records)
+
+
+# ======================
+# ENGINE
+# ======================
+class HostLimiter:
+    """Caps how many sessions may scrape the same host at once"""
+
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+
+class GroupQueue:
+    """Hands (group, url) pairs to the workers in start_urls order.
+
+    The adapter's last_groups are held back until every other group has
+    finished, whatever the worker count, so the deduper always keeps the
+    other groups' copies of a record.
+    """
+
+    def __init__(self, start_urls, last_groups=()):
+        self.last_groups = set(last_groups)
+        self.first = collections.deque(start for start in start_urls if start[0] not in self.last_groups)
+        self.last = collections.deque(start for start in start_urls if start[0] in self.last_groups)
+        self.unfinished = len(self.first)
+        self._ready = threading.Condition()
+
+    def get(self):
+        """Next (group, url) to scrape, or None once nothing is left"""
+        with self._ready:
+            if self.first:
+                return self.first.popleft()
+            while self.unfinished and self.last:
+                self._ready.wait()
+            return self.last.popleft() if self.last else None
+
+    def task_done(self, group):
+        with self._ready:
+            if group not in self.last_groups:
+                self.unfinished -= 1
+                self._ready.notify_all()
+
+
+def paginate(adapter, fetcher, group, url, max_pages=None, sink=None, checkpoint=None, start_page=1,
+             changes=None):
+    """Walk the pages of a group the fetcher has already opened.
+
+    Each page's records go to the sink as soon as the page is extracted.
+    Without a sink they are collected and returned as a list. With a
+    checkpoint every completed page is recorded, and the group is marked
+    finished once its last page has been scraped. With a ChangeTracker,
+    pages whose listing block is unchanged since the last run are neither
+    extracted nor written.
+    """
+    max_pages = max_pages or adapter.max_pages
+    if sink is None:
+        memory = MemorySink()
+        paginate(adapter, fetcher, group, url, max_pages, memory, checkpoint, start_page, changes)
+        return memory.records
+
+    written = 0
+    page = start_page
+    finished = page > max_pages
+
+    while page <= max_pages:
+        print(f"   📄 [{group}] Processing page {page}...")
+        status, _ = fetcher.last_response()
+        if not succeeded(status):
+            # An error page would be checkpointed as an empty page; left unfinished so a rerun fetches it again
+            print(f"   ❌ [{group}] Page {page} answered {status} - stopping here")
+            break
+        fetcher.wait_ready(adapter.listing_selector)
+
+        fingerprint = adapter.page_fingerprint(fetcher) if changes is not None else None
+        if changes is not None and changes.unchanged(group, page, fingerprint):
+            print(f"   ⏭ [{group}] Page {page} unchanged since the last run")
+            if checkpoint is not None:
+                checkpoint.page_done(group, page, 0)
+            metrics.count(pages=1)
+        else:
+            html = None
+            if CACHE_RESPONSES:
+                try:
+                    html = adapter.page_html(fetcher)
+                    with metrics.stage("cache"):
+                        response_cache.store_page(adapter, fetcher, group, page, html)
+                except Exception as e:
+                    print(f"   ⚠️ [{group}] Could not cache page {page}: {str(e)}")
+            try:
+                with metrics.stage("extract"):
+                    page_records = adapter.extract_page(fetcher, group, html)
+            except Exception as e:
+                print(f"   ❌ [{group}] Error scraping page: {str(e)}")
+                page_records = []
+            with metrics.stage("write"):
+                kept = sink.write(page_records)  # What is left after dropping duplicates
+            written += kept
+            if changes is not None and page_records:
+                changes.page_extracted(group, page, fingerprint, page_records)
+            if checkpoint is not None:
+                checkpoint.page_done(group, page, kept)
+            transferred = fetcher.transfer_bytes()
+            metrics.count(pages=1, records=kept, bytes=transferred)
+            print(f"   ✔ [{group}] Found {len(page_records)} records on this page "
+                  f"({format_bytes(transferred)} transferred)")
+
+        if page == max_pages:
+            finished = True
+            break
+        # Paced per host; the pace follows how the server answers
+        host_rates.wait(url)
+        requested = time.monotonic()
+        try:
+            with metrics.stage("navigation"):
+                moved = adapter.next_page(fetcher, group, url, page)
+            if not moved:
+                print(f"   ⏹ [{group}] Last page reached")
+                finished = True
+                break
+            status, retry_after = fetcher.last_response()
+            host_rates.feedback(url, status, time.monotonic() - requested, retry_after)
+        except Exception as e:
+            # Left unfinished so a rerun resumes after the last completed page
+            print(f"   ❌ [{group}] Error during pagination: {str(e)}")
+            break
+        page += 1
+
+    if finished and changes is not None:
+        changes.finish_group(group)
+    if finished and CACHE_RESPONSES:
+        response_cache.trim(adapter.source or adapter.name, group, page)
+    if finished and checkpoint is not None:
+        checkpoint.group_done(group)
+    return written
+
+
+def scrape_group(adapter, fetcher, group, url, max_pages=None, sink=None, checkpoint=None, changes=None):
+    """Open a group and paginate it, resuming from the checkpoint; returns what paginate returns"""
+    nothing = [] if sink is None else 0
+    start_page = checkpoint.start_page(group) if checkpoint is not None else 1
+    if start_page is None:
+        print(f"\n⏭ {adapter.name}: {group} already finished ({checkpoint.records(group)} records)")
+        return nothing
+
+    print(f"\n🔍 Scraping {adapter.name}: {group}")
+    try:
+        host_rates.wait(url)
+        requested = time.monotonic()
+        with metrics.stage("navigation"):
+            adapter.open_group(fetcher, group, url)
+        status, retry_after = fetcher.last_response()
+        host_rates.feedback(url, status, time.monotonic() - requested, retry_after)
+        if start_page > 1:
+            print(f"   ↩️ [{group}] Resuming at page {start_page} "
+                  f"({checkpoint.records(group)} records already saved)")
+            with metrics.stage("navigation"):
+                resumed = adapter.resume_page(fetcher, group, url, start_page)
+            if not resumed:
+                print(f"   ⏹ [{group}] Page {start_page} is no longer available")
+                checkpoint.group_done(group)
+                return nothing
+        return paginate(adapter, fetcher, group, url, max_pages, sink, checkpoint, start_page, changes)
+    except Exception as e:
+        print(f"❌ Error in {group}: {str(e)}")
+        return nothing
+
+
+def _worker(worker_id, adapter, groups, limiter, sink, max_pages, checkpoint, changes):
+    fetcher = adapter.create_fetcher()
+    try:
+        if not adapter.prepare(fetcher):
+            print(f"❌ Worker {worker_id} could not prepare a {adapter.name} session")
+            return
+        while True:
+            start = groups.get()
+            if start is None:
+                break
+            group, url = start
+            try:
+                with limiter.slot(url):
+                    written = scrape_group(adapter, fetcher, group, url, max_pages, sink, checkpoint, changes)
+            finally:
+                groups.task_done(group)
+            print(f"✅ [worker {worker_id}] Finished '{group}' with {written} records")
+    except Exception as e:
+        print(f"❌ Critical error in worker {worker_id}: {str(e)}")
+    finally:
+        fetcher.close()
+
+
+def run_adapter(adapter, workers=1, max_per_host=MAX_SESSIONS_PER_HOST, max_pages=None, sink=None,
+                checkpoint=None, changes=None):
+    """Scrape every start URL of an adapter, optionally across a pool of sessions.
+
+    Each worker owns a fetcher and takes groups from a shared queue. Records
+    are streamed to the sink page by page and the number written is
+    returned; without a sink the records themselves are returned, in
+    start_urls order whatever the worker count. Groups the checkpoint has
+    as finished are skipped and unfinished ones resume after their last
+    completed page. With a ChangeTracker only pages that changed since the
+    last run are extracted.
+    """
+    streaming = sink is not None
+    if not streaming:
+        sink = MemorySink()
+    if adapter.dedupe_fields and not isinstance(sink, DedupingSink):
+        sink = DedupingSink(sink, Deduper.for_adapter(adapter))
+
+    metrics.start(adapter.name)
+    start_urls = list(adapter.start_urls())
+    groups = GroupQueue(start_urls, adapter.last_groups)
+    for _, url in start_urls:
+        host_rates.configure(url, *adapter.rate_limits)
+
+    limiter = HostLimiter(max_per_host)
+    threads = [
+        threading.Thread(target=_worker, args=(n, adapter, groups, limiter, sink, max_pages, checkpoint, changes))
+        for n in range(1, max(1, min(workers, len(start_urls))) + 1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    readiness_report.summary()
+    host_rates.summary()
+    metrics.export()
+    if not streaming and isinstance(sink, DedupingSink):
+        sink.deduper.report()
+    if streaming:
+        return sink.count
+    return _in_group_order(adapter, sink.records)
+
+
+def replay_adapter(adapter, sink=None, cache=response_cache):
+    """Re-run extraction over the cached pages of every start URL, without any network access.
+
+    Pages go through the adapter's extract_records, so a changed parser or a
+    new field can be backfilled across every cached page. Records are dated
+    by when their page was fetched, not by today. Returns what run_adapter
+    returns.
+    """
+    streaming = sink is not None
+    if not streaming:
+        sink = MemorySink()
+    if adapter.dedupe_fields and not isinstance(sink, DedupingSink):
+        sink = DedupingSink(sink, Deduper.for_adapter(adapter))
+
+    metrics.start(adapter.name, mode="replay")
+    source = adapter.source or adapter.name
+    # Same order as a live run, so the same copies of a record are kept
+    for group in scrape_order(adapter):
+        pages = cache.pages(source, group)
+        if not pages:
+            print(f"⚠️ No cached pages for {adapter.name}: {group}")
+            continue
+        found = 0
+        for response in pages:
+            with metrics.stage("extract"):
+                page_records = adapter.extract_records(response.body, group, response.url)
+            fetched_on = response.fetched_at[:10]
+            if adapter.date_field:
+                for record in page_records:
+                    record[adapter.date_field] = fetched_on
+            adapter.replayed_on = max(adapter.replayed_on or fetched_on, fetched_on)
+            with metrics.stage("write"):
+                kept = sink.write(page_records)
+            metrics.count(pages=1, records=kept)
+            found += kept
+        print(f"♻️ [{group}] Replayed {len(pages)} cached pages ({found} records, "
+              f"fetched {min(r.fetched_at for r in pages)[:10]} to {max(r.fetched_at for r in pages)[:10]})")
+
+    metrics.export()
+    if isinstance(sink, DedupingSink):
+        sink.deduper.report()
+    if streaming:
+        return sink.count
+    return _in_group_order(adapter, sink.records)
+
+
+def scrape_order(adapter):
+    """Groups in the order a run finishes them: start_urls order, with last_groups after the others"""
+    groups = [group for group, _ in adapter.start_urls()]
+    return sorted(groups, key=lambda group: group in adapter.last_groups)
+
+
+def _in_group_order(adapter, records):
+    if adapter.group_field is None:
+        return records
+    order = {group: i for i, (group, _) in enumerate(adapter.start_urls())}
+    return sorted(records, key=lambda record: order.get(record.get(adapter.group_field), len(order)))
+
+
+def store_records(adapter, df, output_file=None, run_date=None):
+    """Store scraped records as the site's raw Parquet stage, plus the optional report file"""
+    output_file = output_file or adapter.output_file
+    partition_by = (adapter.group_field,) if adapter.group_field else ()
+    snapshot = write_stage(df, "raw", adapter.source or adapter.name, run_date, partition_by=partition_by,
+                           dtypes=adapter.dtypes)
+    print(f"\n🎉 Success! Saved {len(df)} {adapter.name} records to '{snapshot}'")
+    if adapter.price_history:
+        record_prices(df, adapter.source or adapter.name, run_date, **adapter.price_history)
+    if export_report(df, output_file):
+        print(f"📄 Report written to '{output_file}'")
+
+
+def store_changes(adapter, changes, output_file=None):
+    """Store a change-detection run's delta feed and record the prices of new and repriced items"""
+    delta = changes.delta_frame(scrape_order(adapter))
+    print(f"\n⏭ {changes.skipped} unchanged pages skipped, {changes.extracted} pages extracted")
+    if delta.empty:
+        print(f"✅ No {adapter.name} items changed since the last run")
+        return delta
+
+    source = adapter.source or adapter.name
+    snapshot = write_stage(delta, DELTA_STAGE, source, dtypes=adapter.dtypes)
+    counts = delta["change"].value_counts()
+    print(f"🔁 {adapter.name} delta: {counts.get('new', 0)} new, {counts.get('removed', 0)} removed, "
+          f"{counts.get('repriced', 0)} repriced - saved to '{snapshot}'")
+    if adapter.price_history:
+        record_prices(delta[delta["change"] != "removed"], source, **adapter.price_history)
+    output_file = output_file or adapter.output_file
+    if output_file:
+        base, ext = os.path.splitext(output_file)
+        export_report(delta, f"{base}_delta{ext}")
+    return delta
+
+
+def save_records(adapter, records, output_file=None, run_date=None):
+    """Store a list of records (see store_records)"""
+    if not records:
+        print(f"⚠️ No {adapter.name} records were scraped")
+        return None
+
+    df = adapter.to_frame(records)
+    store_records(adapter, df, output_file, run_date)
+    return df
+
+
+def save_replay(adapter, output_file=None):
+    """Replay the cached pages (see replay_adapter) and store them under the day they were fetched"""
+    # Today's raw snapshot and price observations must not be overwritten with older pages
+    records = replay_adapter(adapter)
+    return save_records(adapter, records, output_file, run_date=adapter.replayed_on)
+
+
+def run_path(adapter, output_file=None, changes_only=False):
+    """Path the staging file and checkpoint of a run are named after"""
+    if output_file is None and adapter.run_id:
+        # A run resumed after midnight must find the checkpoint its dated output_file no longer names
+        base = os.path.join(RUNS_DIR, adapter.run_id)
+    else:
+        base = output_file or adapter.output_file
+    if changes_only:
+        # A change-detection run stages only changed pages, so it never resumes a full run (or vice versa)
+        root, ext = os.path.splitext(base)
+        base = f"{root}_changes{ext}"
+    return base
+
+
+def open_run(adapter, fmt=SINK_FORMAT, output_file=None, changes_only=False):
+    """Sink and checkpoint for a run, picking up an unfinished previous run of the same output and mode"""
+    base = run_path(adapter, output_file, changes_only)
+    staging = staging_path(base, fmt)
+    checkpoint = CheckpointStore(checkpoint_path(base), staging)
+    if checkpoint.resuming and not SINKS[fmt].appendable:
+        print(f"⚠️ {fmt} staging files cannot be resumed - starting over")
+        checkpoint.reset()
+    if checkpoint.resuming:
+        print(f"↩️ Resuming unfinished {adapter.name} run from {checkpoint.path}")
+    sink = SINKS[fmt](staging, append=checkpoint.resuming)
+    if adapter.dedupe_fields:
+        deduper = Deduper.for_adapter(adapter)
+        if checkpoint.resuming:
+            deduper.prime(sink.read_frame().to_dict("records"))
+        sink = DedupingSink(sink, deduper)
+    return sink, checkpoint
+
+
+def finalize_records(adapter, sink, output_file=None, checkpoint=None, changes=None):
+    """Store everything streamed to the sink (see store_records).
+
+    While the checkpoint still has unfinished groups nothing is stored and
+    None is returned: the staging file and checkpoint are kept, so the rerun
+    that finishes the last group stores the whole run once. Otherwise both
+    are removed. In change-detection mode the sink only holds the changed
+    pages, so the delta feed is stored instead (see store_changes) and
+    returned.
+    """
+    complete = checkpoint is None or checkpoint.is_complete(group for group, _ in adapter.start_urls())
+    if isinstance(sink, DedupingSink):
+        sink.deduper.report()
+    if not complete:
+        sink.close()
+        print(f"⏸ Some {adapter.name} groups did not finish - rerun to resume from {checkpoint.path}")
+        return None
+
+    df = finalize(sink, None, to_frame=lambda records: adapter.to_frame(_in_group_order(adapter, records)))
+    if changes is not None:
+        df = store_changes(adapter, changes, output_file)
+        changes.clear()
+    elif df is None:
+        print(f"⚠️ No {adapter.name} records were scraped")
+    else:
+        store_records(adapter, df, output_file)
+
+    if checkpoint is not None:
+        checkpoint.clear()
+    return df
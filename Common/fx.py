@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+# ======================
+# CONFIGURATION
+# ======================
+FX_RATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fx_rates.csv")
+BASE_CURRENCY = "KSH"  # Rates in the table are KSH per unit of currency
+
+# Spellings used by the sites, mapped to the table's currency codes
+CURRENCY_ALIASES = {"KES": "KSH", "R": "ZAR", "RAND": "ZAR", "$": "USD"}
+
+
+class FXTable:
+    """Dated exchange rates (date, currency, rate) for converting whole price columns.
+
+    Rates are sorted by date once, so a conversion is a single merge_asof
+    join: each amount takes the latest rate on or before its date, or the
+    earliest known rate for dates before the table starts.
+    """
+
+    def __init__(self, rates):
+        rates = rates.rename(columns=str.lower)[["date", "currency", "rate"]].copy()
+        rates["date"] = pd.to_datetime(rates["date"]).astype("datetime64[ns]")
+        rates["currency"] = normalize_currency(rates["currency"])
+        rates["rate"] = rates["rate"].astype(float)
+        self.rates = rates.sort_values("date", kind="stable").reset_index(drop=True)
+        self.earliest = self.rates.groupby("currency")["rate"].first()
+
+    @classmethod
+    def load(cls, path=FX_RATES_FILE):
+        rates = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+        return cls(rates)
+
+    def currencies(self):
+        return sorted(self.earliest.index)
+
+    def to_base(self, amounts, currency, dates):
+        """Convert amounts (Series) in currency (code or Series) at dates (date or Series) to KSH"""
+        amounts = pd.Series(amounts, dtype=float)
+        if amounts.empty:
+            return pd.Series(dtype=float, index=amounts.index)
+        frame = pd.DataFrame({
+            "position": range(len(amounts)),
+            "amount": amounts.to_numpy(),
+            "currency": normalize_currency(pd.Series(currency, index=amounts.index)).to_numpy(),
+            "date": pd.to_datetime(pd.Series(dates, index=amounts.index)).astype("datetime64[ns]").to_numpy(),
+        })
+        # merge_asof needs identical key dtypes, whatever dtype the caller's currency column had
+        frame["currency"] = frame["currency"].astype(self.rates["currency"].dtype)
+        known = frame["date"].notna()
+
+        joined = pd.merge_asof(
+            frame[known].sort_values("date", kind="stable"), self.rates,
+            on="date", by="currency", direction="backward",
+        )
+        rates = pd.Series(float("nan"), index=frame["position"])
+        rates[joined["position"].to_numpy()] = joined["rate"].to_numpy()
+        # Before the first dated rate, or with no date at all, use the earliest rate
+        rates = rates.fillna(frame["currency"].map(self.earliest).set_axis(rates.index))
+        return pd.Series(frame["amount"].to_numpy() * rates.to_numpy(), index=amounts.index)
+
+
+def normalize_currency(currency):
+    codes = pd.Series(currency).astype(str).str.strip().str.upper()
+    return codes.replace(CURRENCY_ALIASES)
+
+
+_tables = {}
+
+
+def get_fx_table(path=FX_RATES_FILE):
+    """FXTable for a rates file, read from disk only on first use"""
+    if path not in _tables:
+        _tables[path] = FXTable.load(path)
+    return _tables[path]
@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+from datetime import date
+
+import pandas as pd
+
+# ======================
+# CONFIGURATION
+# ======================
+HISTORY_FILE = "Data Store/price_history.sqlite"  # Every run's prices, one row per price change
+PRICE_PATTERN = r'(\d[\d,]*(?:\.\d+)?)'  # First amount in a price string such as "KSh 1,234.00"
+MISSING_IDS = {"", "n/a", "none", "nan"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT,
+    category TEXT,
+    cpi_item TEXT,
+    url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_cpi_item ON items (cpi_item);
+CREATE INDEX IF NOT EXISTS items_source ON items (source);
+CREATE TABLE IF NOT EXISTS prices (
+    item_id TEXT NOT NULL,
+    observed_on TEXT NOT NULL,
+    price REAL NOT NULL,
+    currency TEXT NOT NULL,
+    PRIMARY KEY (item_id, observed_on)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_key(values):
+    """Lowercased, whitespace-collapsed identifiers; missing ones become NA"""
+    keys = pd.Series(values, dtype="string").str.lower().str.split().str.join(" ")
+    return keys.mask(keys.isin(MISSING_IDS))
+
+
+def stable_ids(source, values):
+    """Item IDs that stay the same across runs: <source>:<hash of the normalized key>"""
+    keys = normalize_key(values)
+    return keys.map(lambda key: f"{source}:{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}",
+                    na_action="ignore")
+
+
+def parse_prices(values):
+    """First amount in each price string as a float (NaN when there is none)"""
+    prices = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices.astype("float64")
+    digits = prices.astype("string").str.extract(PRICE_PATTERN, expand=False).str.replace(",", "", regex=False)
+    return pd.to_numeric(digits, errors="coerce").astype("float64")
+
+
+class PriceHistory:
+    """SQLite time series of item prices, fed by upserting each run's records.
+
+    items holds one row per product or listing (keyed on a stable ID) with
+    the dates it was first and last seen. prices holds a row only when an
+    item's price differs from its previous observation, so a price is valid
+    from its observed_on date until the next row. The (item_id, observed_on)
+    primary key keeps "price of X on date D" lookups to one index seek.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def upsert(self, df, source, run_date=None, id_column="url", price_column="price", name_column=None,
+               category_column=None, url_column=None, currency="KSH"):
+        """Record one run's prices; rerunning the same date replaces that date's observations.
+
+        Returns (new items, price rows written).
+        """
+        run_date = str(run_date or date.today().isoformat())
+
+        def column(name):
+            return df[name].to_numpy() if name and name in df else None
+
+        rows = pd.DataFrame({
+            "item_id": stable_ids(source, df[id_column]).to_numpy(),
+            "price": parse_prices(df[price_column]).to_numpy(),
+            "name": column(name_column),
+            "category": column(category_column),
+            "url": column(url_column),
+        })
+        rows = rows.dropna(subset=["item_id", "price"]).drop_duplicates("item_id")
+        rows = rows.astype(object).where(rows.notna(), None)
+        if rows.empty:
+            return 0, 0
+
+        with self.conn:
+            known = self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO items (item_id, source, name, category, url, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (item_id) DO UPDATE SET "
+                "name = COALESCE(excluded.name, name), category = COALESCE(excluded.category, category), "
+                "url = COALESCE(excluded.url, url), first_seen = MIN(first_seen, excluded.first_seen), "
+                "last_seen = MAX(last_seen, excluded.last_seen)",
+                [(r.item_id, source, r.name, r.category, r.url, run_date, run_date)
+                 for r in rows.itertuples(index=False)],
+            )
+            new_items = self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] - known
+
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (item_id TEXT PRIMARY KEY, price REAL)")
+            self.conn.execute("DELETE FROM incoming")
+            self.conn.executemany("INSERT INTO incoming VALUES (?, ?)", rows[["item_id", "price"]].itertuples(index=False))
+            self.conn.execute(
+                "DELETE FROM prices WHERE observed_on = ? AND item_id IN (SELECT item_id FROM incoming)", (run_date,))
+            # Only prices that differ from the one in effect before this date become new rows
+            written = self.conn.execute(
+                "INSERT INTO prices (item_id, observed_on, price, currency) "
+                "SELECT i.item_id, ?, i.price, ? FROM incoming i "
+                "WHERE i.price IS NOT (SELECT p.price FROM prices p WHERE p.item_id = i.item_id "
+                "AND p.observed_on < ? ORDER BY p.observed_on DESC LIMIT 1)",
+                (run_date, currency, run_date),
+            ).rowcount
+        return new_items, written
+
+    def set_cpi_items(self, item_ids, cpi_items):
+        """Tag items with the CPI basket item they were matched to"""
+        with self.conn:
+            self.conn.executemany("UPDATE items SET cpi_item = ? WHERE item_id = ?",
+                                  [(cpi, item_id) for item_id, cpi in zip(item_ids, cpi_items)
+                                   if pd.notna(item_id)])
+
+    def history(self, item_id=None, cpi_item=None):
+        """Every price change of one item, or of all items matched to a CPI item"""
+        where, value = ("i.item_id = ?", item_id) if item_id is not None else ("i.cpi_item = ?", cpi_item)
+        return pd.read_sql_query(
+            "SELECT i.item_id, i.name, i.category, p.observed_on, p.price, p.currency FROM items i "
+            f"JOIN prices p ON p.item_id = i.item_id WHERE {where} ORDER BY i.item_id, p.observed_on",
+            self.conn, params=(value,))
+
+    def year_over_year(self, cpi_item, on_date=None):
+        """Price of every item matched to cpi_item on on_date and one year earlier"""
+        now = pd.Timestamp(on_date or date.today())
+        dates = {"now": now.date().isoformat(), "then": (now - pd.DateOffset(years=1)).date().isoformat()}
+        as_of = ("(SELECT p.price FROM prices p WHERE p.item_id = i.item_id AND p.observed_on <= :{0} "
+                 "ORDER BY p.observed_on DESC LIMIT 1)")
+        df = pd.read_sql_query(
+            f"SELECT i.item_id, i.name, {as_of.format('then')} AS price_year_ago, {as_of.format('now')} AS price_now "
+            "FROM items i WHERE i.cpi_item = :cpi AND i.first_seen <= :now",
+            self.conn, params={"cpi": cpi_item, **dates})
+        df["change_pct"] = (df["price_now"] / df["price_year_ago"] - 1) * 100
+        return df
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_prices(df, source, run_date=None, path=HISTORY_FILE, **columns):
+    """Upsert a run into the price history and report what changed"""
+    with PriceHistory(path) as history:
+        new_items, written = history.upsert(df, source, run_date, **columns)
+    print(f"📈 Price history: {written} price changes recorded, {new_items} new {source} items")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the price history")
+    parser.add_argument("cpi_item", help="CPI basket item, e.g. 'maize flour'")
+    parser.add_argument("--date", default=date.today().isoformat(), help="compare this date with a year earlier")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    args = parser.parse_args()
+
+    with PriceHistory(args.history) as history:
+        print(history.year_over_year(args.cpi_item.lower(), args.date).to_string(index=False))
@@ -0,0 +1,140 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# ======================
+# CONFIGURATION
+# ======================
+CACHE_DIR = "Data Store/http_cache"  # Index plus one gzipped blob per distinct response body
+CACHE_RESPONSES = True  # Write every scraped listing page through to the cache
+COMPRESS_LEVEL = 6
+
+# Listing cards only, as a minimal page: cached instead of the full page_source
+# by sites that read their records in the browser. The HTML parsers select
+# cards by class, so the cached pages replay the same way.
+LISTING_HTML_JS = """
+return '<html><body>' + Array.from(document.querySelectorAll(arguments[0]), card => card.outerHTML).join('\\n')
+    + '</body></html>';
+"""
+
+CachedResponse = namedtuple("CachedResponse", "url status headers body fetched_at page")
+
+
+def normalize_url(url):
+    """URL with its query parameters sorted, so equivalent URLs share a cache entry"""
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse(parsed._replace(query=query, fragment=""))
+
+
+def _url_key(url):
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Content-addressed store of fetched pages for replaying extraction offline.
+
+    Bodies are gzipped under blobs/ and named by their SHA-256, so a page
+    that has not changed between runs is stored once. The SQLite index maps
+    each normalized URL to its latest body, status, headers and fetch time,
+    and listing pages also to the (source, group, page) they were scraped as.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Opened on first use so importing the engine creates no files
+        if self.conn is None:
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            self.conn = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url_key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER, headers TEXT, body_hash TEXT NOT NULL, "
+                "fetched_at TEXT NOT NULL, source TEXT, grp TEXT, page INTEGER)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS responses_page ON responses (source, grp, page)")
+            self.conn.commit()
+        return self.conn
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self.root, "blobs", body_hash[:2], body_hash + ".gz")
+
+    def _write_blob(self, body):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        body_hash = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(gzip.compress(data, COMPRESS_LEVEL))
+            os.replace(temp_path, path)
+        return body_hash
+
+    def _read_blob(self, body_hash):
+        with open(self._blob_path(body_hash), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8", errors="replace")
+
+    def put(self, url, body, status=None, headers=None, source=None, group=None, page=None):
+        """Store a response; a listing page replaces whatever was cached for the same source/group/page"""
+        if not url or not body:
+            return None
+        body_hash = self._write_blob(body)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if page is not None:
+                    conn.execute("DELETE FROM responses WHERE source = ? AND grp = ? AND page = ?",
+                                 (source, group, page))
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (_url_key(url), url, status, json.dumps(dict(headers or {})),
+                     body_hash, datetime.now().isoformat(timespec="seconds"), source, group, page),
+                )
+        return body_hash
+
+    def _response(self, row):
+        url, status, headers, body_hash, fetched_at, page = row
+        return CachedResponse(url, status, json.loads(headers or "{}"), self._read_blob(body_hash), fetched_at, page)
+
+    def get(self, url):
+        """Latest cached response for a URL, or None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT url, status, headers, body_hash, fetched_at, page FROM responses WHERE url_key = ?",
+                (_url_key(url),)).fetchone()
+        return self._response(row) if row else None
+
+    def pages(self, source, group):
+        """Cached listing pages of a group, in page order"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url, status, headers, body_hash, fetched_at, page FROM responses "
+                "WHERE source = ? AND grp = ? ORDER BY page", (source, group)).fetchall()
+        return [self._response(row) for row in rows]
+
+    def trim(self, source, group, last_page):
+        """Forget pages past the group's last page, left over from longer earlier runs"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM responses WHERE source = ? AND grp = ? AND page > ?",
+                             (source, group, last_page))
+
+    def store_page(self, adapter, fetcher, group, page, html=None):
+        """Write the fetcher's current page (or html already read from it) through to the cache"""
+        status, _ = fetcher.last_response()
+        self.put(fetcher.current_url, adapter.page_html(fetcher) if html is None else html, status,
+                 fetcher.response_headers(), adapter.source or adapter.name, group, page)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,201 @@
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# ======================
+# CONFIGURATION
+# ======================
+METRICS_DIR = "Data Store/metrics"  # One JSON report per scraping run
+PROMETHEUS_DIR = None  # node_exporter textfile-collector directory; None skips the .prom export
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # Histogram upper bounds, in seconds
+# Report order; stages not listed here follow in the order they were first seen
+STAGES = ("modal", "navigation", "wait", "transfer", "parse", "extract", "cache", "write")
+COUNTERS = ("pages", "records", "bytes", "page_source_chars")
+
+
+class Histogram:
+    """Latency histogram over fixed buckets, plus count, sum and max"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (capped at the max seen)"""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        cumulative, seen = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "seconds": round(self.total, 4),
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "p50": round(self.quantile(0.5), 4),
+            "p95": round(self.quantile(0.95), 4),
+            "max": round(self.max, 4),
+            "buckets": cumulative,
+        }
+
+
+class RunMetrics:
+    """Per-stage latency histograms and throughput counters of one scraping run.
+
+    Stages are timed exclusively: time spent in a stage nested inside
+    another (a readiness wait inside navigation, building the document tree
+    inside extraction) counts only for the inner one, so the stage totals
+    add up to the time the workers actually spent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.start()
+
+    def start(self, site=None, mode="scrape"):
+        """Clear everything recorded so far and start timing a new run"""
+        with self._lock:
+            self.site = site
+            self.mode = mode
+            self.started_at = datetime.now()
+            self.started = time.monotonic()
+            self.stages = {}
+            self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as one observation of a stage (per thread; use observe from asyncio)"""
+        stack = self._local.__dict__.setdefault("stack", [])
+        nested = [0.0]
+        stack.append(nested)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            self.observe(name, elapsed - nested[0])
+
+    def observe(self, name, seconds):
+        with self._lock:
+            if name not in self.stages:
+                self.stages[name] = Histogram()
+            self.stages[name].observe(seconds)
+
+    def count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        with self._lock:
+            duration = time.monotonic() - self.started
+            order = {name: i for i, name in enumerate(STAGES)}
+            names = sorted(self.stages, key=lambda name: order.get(name, len(order)))
+            stages = {name: self.stages[name].to_dict() for name in names}
+            counters = dict(self.counters)
+        minutes = duration / 60
+        return {
+            "site": self.site,
+            "mode": self.mode,
+            "started": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(duration, 3),
+            **counters,
+            "pages_per_minute": round(counters["pages"] / minutes, 2) if minutes else None,
+            "records_per_minute": round(counters["records"] / minutes, 2) if minutes else None,
+            "stages": stages,
+        }
+
+    def summary(self, report=None):
+        report = report or self.report()
+        if not report["stages"]:
+            return
+        print(f"📊 {report['site']}: {report['pages']} pages, {report['records']} records in "
+              f"{report['duration_seconds']:.1f}s ({report['pages_per_minute']:.1f} pages/min, "
+              f"{report['records_per_minute']:.0f} records/min, {report['bytes'] / 1024 ** 2:.1f} MB transferred)")
+        total = sum(stage["seconds"] for stage in report["stages"].values()) or 1
+        for name, stage in report["stages"].items():
+            print(f"   {name:<10} {stage['seconds']:8.2f}s {stage['seconds'] / total:6.1%}  "
+                  f"p50 {stage['p50']:.3f}s  p95 {stage['p95']:.3f}s  ({stage['count']} calls)")
+
+    def export(self, directory=METRICS_DIR, prometheus_dir=PROMETHEUS_DIR):
+        """Print the summary, write the JSON run report and, when configured, the Prometheus textfile"""
+        report = self.report()
+        self.summary(report)
+        site = _slug(report["site"] or "scraper")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{site}_{report['mode']}_{self.started_at:%Y%m%d-%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📊 Run metrics saved to '{path}'")
+        if prometheus_dir:
+            write_textfile(report, os.path.join(prometheus_dir, f"scraper_{site}.prom"))
+        return path
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def prometheus_text(report):
+    """A run report in the Prometheus text exposition format"""
+    labels = f'site="{report["site"]}",mode="{report["mode"]}"'
+    lines = [
+        "# HELP scraper_stage_seconds Time spent in each scraping stage",
+        "# TYPE scraper_stage_seconds histogram",
+    ]
+    for name, stage in report["stages"].items():
+        for bound, count in stage["buckets"].items():
+            lines.append(f'scraper_stage_seconds_bucket{{{labels},stage="{name}",le="{bound}"}} {count}')
+        lines.append(f'scraper_stage_seconds_sum{{{labels},stage="{name}"}} {stage["seconds"]}')
+        lines.append(f'scraper_stage_seconds_count{{{labels},stage="{name}"}} {stage["count"]}')
+    gauges = {
+        "pages": "Listing pages processed in the last run",
+        "records": "Records written in the last run",
+        "bytes": "Bytes transferred over the network in the last run",
+        "page_source_chars": "Characters of page source read from the browser in the last run",
+        "duration_seconds": "Wall-clock duration of the last run",
+        "pages_per_minute": "Pages processed per minute in the last run",
+        "records_per_minute": "Records written per minute in the last run",
+    }
+    for name, help_text in gauges.items():
+        lines += [f"# HELP scraper_{name} {help_text}", f"# TYPE scraper_{name} gauge",
+                  f"scraper_{name}{{{labels}}} {report[name] or 0}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(report, path):
+    """Write atomically, so the textfile collector never reads half a file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(report))
+    os.replace(temp_path, path)
+
+
+metrics = RunMetrics()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+# ======================
+# CONFIGURATION
+# ======================
+MIN_RATE = 0.1  # Floor, in requests per second per host (one every 10 s)
+MAX_RATE = 2.0  # Ceiling, in requests per second per host
+START_RATE = 0.5  # Where a host starts before any responses come back
+BURST = 1  # Requests a host may receive back-to-back
+RATE_STEP = 0.1  # Added to the rate after each fast, successful response
+BACKOFF = 0.5  # Rate multiplier on 429/503
+SLOWDOWN = 0.8  # Rate multiplier when latency climbs
+LATENCY_RISE = 2.0  # Latency this many times the host's best counts as climbing
+LATENCY_SMOOTHING = 0.3  # Weight of the newest response in the latency average
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRIES = 3  # Times a throttled request is sent again, each after the host's pause
+
+
+class HostRate:
+    """Token bucket for one host whose rate follows the server's responses.
+
+    Fast 200s raise the rate by RATE_STEP; 429/503 halve it and honor
+    Retry-After; latency rising well above the best seen so far trims it.
+    The rate always stays between floor and ceiling.
+    """
+
+    def __init__(self, floor=MIN_RATE, ceiling=MAX_RATE, start=START_RATE, burst=BURST):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.rate = min(max(start, floor), ceiling)
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.latency = None
+        self.best_latency = None
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+        self.first_request = None
+        self.last_request = None
+
+    def reserve(self):
+        """Take the next slot; returns how long the caller must wait before sending"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        delay = max(-self.tokens / self.rate, self.paused_until - now, 0)
+
+        self.requests += 1
+        self.waited += delay
+        self.first_request = self.first_request or now + delay
+        self.last_request = max(self.last_request or 0, now + delay)
+        return delay
+
+    def feedback(self, status=None, latency=None, retry_after=None):
+        """Adapt the rate to one response (status None when it is not known, e.g. in a browser)"""
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            self.rate = max(self.floor, self.rate * BACKOFF)
+            if retry_after:
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            return
+        if latency is not None:
+            self.latency = latency if self.latency is None else (
+                LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.latency)
+            self.best_latency = min(self.best_latency or self.latency, self.latency)
+            if self.latency > LATENCY_RISE * self.best_latency:
+                self.rate = max(self.floor, self.rate * SLOWDOWN)
+                return
+        if status is None or status < 400:
+            self.rate = min(self.ceiling, self.rate + RATE_STEP)
+
+    @property
+    def effective_rate(self):
+        """Requests per second actually sent to the host so far"""
+        if self.requests < 2 or self.last_request == self.first_request:
+            return None
+        return (self.requests - 1) / (self.last_request - self.first_request)
+
+
+class RateLimiter:
+    """Shared per-host limiters, usable from worker threads and from asyncio"""
+
+    def __init__(self):
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url, floor=MIN_RATE, ceiling=MAX_RATE, start=START_RATE, burst=BURST):
+        """Set a host's floor and ceiling (requests per second) before it is first used"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostRate(floor, ceiling, start, burst)
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostRate()
+        return self.hosts[host]
+
+    def wait(self, url):
+        """Block until the next request to url's host may be sent"""
+        with self._lock:
+            delay = self._host(url).reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire(self, url):
+        """asyncio version of wait"""
+        with self._lock:
+            delay = self._host(url).reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def feedback(self, url, status=None, latency=None, retry_after=None):
+        with self._lock:
+            self._host(url).feedback(status, latency, _seconds(retry_after))
+
+    def summary(self):
+        with self._lock:
+            hosts = list(self.hosts.items())
+        for host, state in hosts:
+            if not state.requests:
+                continue
+            effective = state.effective_rate
+            effective = f"{effective:.2f} req/s" if effective else "n/a"
+            print(f"🚦 {host}: {state.requests} requests at {effective} effective "
+                  f"(rate now {state.rate:.2f}/s, {state.throttled} throttled, waited {state.waited:.1f}s)")
+
+
+def _seconds(retry_after):
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date form of Retry-After; fall back to the plain backoff
+        return None
+
+
+host_rates = RateLimiter()
@@ -0,0 +1,151 @@
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from Common.metrics import metrics
+
+# ======================
+# CONFIGURATION
+# ======================
+QUIET_MS = 300  # Page counts as settled after this long without DOM or network activity
+READY_TIMEOUT = 10  # Upper bound on any single wait
+POLL_INTERVAL = 0.05
+
+# Installed on every new document through CDP. Tracks in-flight fetch/XHR
+# requests and the last DOM mutation so readiness can be checked in one call.
+INSTRUMENT_JS = """
+(() => {
+    if (window.__scraperReady) return;
+    const state = {inflight: 0, lastActivity: performance.now()};
+    window.__scraperReady = state;
+    const touch = () => { state.lastActivity = performance.now(); };
+
+    const origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function () {
+            state.inflight++; touch();
+            return origFetch.apply(this, arguments).finally(() => { state.inflight--; touch(); });
+        };
+    }
+
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.inflight++; touch();
+        this.addEventListener('loadend', () => { state.inflight--; touch(); });
+        return origSend.apply(this, arguments);
+    };
+
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, characterData: true});
+})();
+"""
+
+SIGNATURE_JS = """
+const items = arguments[0] ? document.querySelectorAll(arguments[0]) : [];
+if (!arguments[0]) return '';
+if (!items.length) return null;
+return items.length + '|' + items[0].textContent.trim() + '|' + items[items.length - 1].textContent.trim();
+"""
+
+# Returns false when the tracker is missing, null while the page is still
+# busy, otherwise a signature of the
+# elements matching the selector (count plus first/last card text).
+READY_CHECK_JS = """
+const state = window.__scraperReady;
+if (!state) return false;
+if (document.readyState === 'loading') return null;
+if (state.inflight > 0) return null;
+if (performance.now() - state.lastActivity < arguments[1]) return null;
+""" + SIGNATURE_JS
+
+
+def install_readiness_hooks(driver):
+    """Inject the activity tracker into every page this driver loads"""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INSTRUMENT_JS})
+    try:
+        driver.execute_script(INSTRUMENT_JS)
+    except WebDriverException:
+        pass
+
+
+class ReadinessReport:
+    """Accumulates how long each wait took against the fixed sleep it replaced"""
+
+    def __init__(self):
+        self.waits = []
+        self._lock = threading.Lock()
+
+    def record(self, label, waited, baseline):
+        with self._lock:
+            self.waits.append((label, waited, baseline))
+
+    def time_saved(self):
+        return sum(baseline - waited for _, waited, baseline in self.waits)
+
+    def summary(self):
+        if not self.waits:
+            return
+        waited = sum(w for _, w, _ in self.waits)
+        baseline = sum(b for _, _, b in self.waits)
+        print(f"⏱ Readiness: {len(self.waits)} waits took {waited:.1f}s "
+              f"instead of {baseline:.1f}s of fixed sleeps (saved {self.time_saved():.1f}s)")
+
+
+readiness_report = ReadinessReport()
+
+
+def _page_signature(driver, selector, quiet_ms):
+    try:
+        signature = driver.execute_script(READY_CHECK_JS, selector, quiet_ms)
+    except WebDriverException:
+        return None
+    if signature is False:
+        # The tracker is missing on documents loaded before the hooks were installed
+        try:
+            driver.execute_script(INSTRUMENT_JS)
+        except WebDriverException:
+            pass
+        return None
+    return signature
+
+
+def wait_until_ready(driver, selector=None, previous_signature=None, baseline=0,
+                     label="page", quiet_ms=QUIET_MS, timeout=READY_TIMEOUT, verbose=False):
+    """Block until the network is idle and the DOM has stopped changing.
+
+    With a selector, also waits for matching elements to exist and, when
+    previous_signature is given, for them to differ from that snapshot.
+    Returns the new signature, or None if the page never settled.
+    """
+    start = time.monotonic()
+    signature = None
+
+    def settled(d):
+        nonlocal signature
+        current = _page_signature(d, selector, quiet_ms)
+        if current is None or current == previous_signature:
+            return False
+        signature = current
+        return True
+
+    try:
+        with metrics.stage("wait"):
+            WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(settled)
+    except TimeoutException:
+        pass
+
+    waited = time.monotonic() - start
+    if baseline:
+        readiness_report.record(label, waited, baseline)
+        if verbose:
+            print(f"   ⏱ {label} ready in {waited:.2f}s (saved {baseline - waited:.2f}s)")
+    return signature
+
+
+def products_signature(driver, selector):
+    """Snapshot the current listing so a later wait can detect it changing"""
+    try:
+        return driver.execute_script(SIGNATURE_JS, selector)
+    except WebDriverException:
+        return None
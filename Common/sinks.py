@@ -0,0 +1,246 @@
+import csv
+import json
+import os
+import threading
+
+import pandas as pd
+
+# ======================
+# CONFIGURATION
+# ======================
+SINK_FORMAT = "jsonl"  # "jsonl", "csv" or "parquet"
+STAGING_SUFFIX = ".partial"
+
+
+def _flatten(value):
+    # Tabular formats cannot hold lists (e.g. Buyrent features)
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+class RecordSink:
+    """Appends records to disk as each page finishes.
+
+    Subclasses implement _write for one batch; write() is thread-safe so
+    several workers can share a sink. read_frame() loads everything written
+    so far for the finalize step.
+    """
+
+    extension = None
+    appendable = True  # Whether a later run can add to an existing file
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, records):
+        """Append a batch; returns how many records were written"""
+        if not records:
+            return 0
+        with self._lock:
+            self._write(records)
+            self.count += len(records)
+        return len(records)
+
+    def _write(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def read_frame(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink(RecordSink):
+    """Keeps records in a list, for callers that want them back directly"""
+
+    def __init__(self):
+        self.path = None
+        self.count = 0
+        self.records = []
+        self._lock = threading.Lock()
+
+    def _write(self, records):
+        self.records.extend(records)
+
+    def read_frame(self):
+        return pd.DataFrame(self.records)
+
+
+class JsonlSink(RecordSink):
+    extension = ".jsonl"
+
+    def __init__(self, path, append=False):
+        super().__init__(path, append)
+        if append and os.path.exists(path):
+            self._trim_partial_line()
+
+    def _trim_partial_line(self):
+        # A run killed mid-write leaves half a record; its page was never checkpointed, so it is scraped again
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                print(f"⚠️ Dropped a partial last record from {self.path}")
+
+    def _write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def read_frame(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        return pd.read_json(self.path, lines=True, dtype=False, convert_dates=False)
+
+
+class CsvSink(RecordSink):
+    extension = ".csv"
+
+    def __init__(self, path, append=False):
+        super().__init__(path, append)
+        self.fieldnames = None
+        if append and os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                self.fieldnames = next(csv.reader(f), None)
+
+    def _write(self, records):
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        if self.fieldnames is None:
+            self.fieldnames = columns
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.DictWriter(f, self.fieldnames).writeheader()
+        else:
+            added = [column for column in columns if column not in self.fieldnames]
+            if added:
+                self._widen(added)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, self.fieldnames)
+            writer.writerows({key: _flatten(value) for key, value in record.items()} for record in records)
+
+    def _widen(self, added):
+        """Rewrite the file with columns that first appeared on a later page, empty in earlier rows"""
+        temp_path = self.path + ".tmp"
+        with open(self.path, newline="", encoding="utf-8") as src, \
+                open(temp_path, "w", newline="", encoding="utf-8") as dst:
+            reader, writer = csv.reader(src), csv.writer(dst)
+            next(reader, None)
+            writer.writerow(self.fieldnames + added)
+            writer.writerows(row + [""] * (len(self.fieldnames) + len(added) - len(row)) for row in reader)
+        os.replace(temp_path, self.path)
+        self.fieldnames = self.fieldnames + added
+
+    def read_frame(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        return pd.read_csv(self.path, dtype=str, keep_default_na=False)
+
+
+class ParquetSink(RecordSink):
+    """One row group per page. The footer is only written on close, so prefer
+    JSONL or CSV when a run may be killed part-way."""
+
+    extension = ".parquet"
+    appendable = False
+
+    def __init__(self, path, append=False):
+        if append and os.path.exists(path):
+            raise ValueError("Parquet files cannot be appended to; use the jsonl or csv sink to resume")
+        super().__init__(path, append)
+        self.writer = None
+        self.schema = None
+
+    def _write(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        if self.writer is None:
+            self.schema = pa.schema([(column, pa.string()) for column in columns])
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        else:
+            added = [column for column in columns if column not in self.schema.names]
+            if added:
+                self._widen(added)
+
+        rows = {
+            column: [None if record.get(column) is None else str(_flatten(record.get(column))) for record in records]
+            for column in self.schema.names
+        }
+        self.writer.write_table(pa.table(rows, schema=self.schema))
+
+    def _widen(self, added):
+        """Rewrite the row groups so far with columns that first appeared on a later page, null in earlier rows"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # A Parquet file has a single schema, so the rows written so far are reread and written again
+        self.writer.close()
+        table = pq.read_table(self.path)
+        for column in added:
+            table = table.append_column(column, pa.nulls(len(table), pa.string()))
+        self.schema = table.schema
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def read_frame(self):
+        self.close()
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        return pd.read_parquet(self.path)
+
+
+SINKS = {
+    "jsonl": JsonlSink,
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+}
+
+
+def staging_path(output_file, fmt=SINK_FORMAT):
+    """Where records for output_file are streamed before finalize"""
+    base, _ = os.path.splitext(output_file)
+    return base + STAGING_SUFFIX + SINKS[fmt].extension
+
+
+def open_sink(output_file, fmt=SINK_FORMAT, append=False):
+    return SINKS[fmt](staging_path(output_file, fmt), append=append)
+
+
+def finalize(sink, output_file, to_frame=None, keep_staging=False):
+    """Turn everything streamed to the sink into the final .xlsx or .csv file (None to only return it)"""
+    sink.close()
+    df = sink.read_frame()
+    if df.empty:
+        return None
+    if to_frame is not None:
+        df = to_frame(df.to_dict("records"))
+
+    if output_file is not None:
+        if output_file.endswith(".csv"):
+            df.to_csv(output_file, index=False)
+        else:
+            df.to_excel(output_file, index=False)
+
+    if not keep_staging and sink.path and os.path.exists(sink.path):
+        os.remove(sink.path)
+    return df
@@ -0,0 +1,116 @@
+import os
+import shutil
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ======================
+# CONFIGURATION
+# ======================
+DATA_ROOT = "Data Store"  # One Parquet dataset per pipeline stage lives under here
+EXPORT_REPORTS = False  # Also write the stage's .xlsx/.csv report files
+PARTITION_COLUMNS = ("source", "run_date")  # Every stage is partitioned by these, then by its own columns
+
+
+def stage_path(stage, root=DATA_ROOT):
+    return os.path.join(root, stage)
+
+
+def _partition_dir(stage, source, run_date, root):
+    return os.path.join(stage_path(stage, root), f"source={source}", f"run_date={run_date}")
+
+
+def write_stage(df, stage, source, run_date=None, partition_by=(), dtypes=None, root=DATA_ROOT):
+    """Store one run of a stage as Parquet under <stage>/source=<source>/run_date=<date>/<partition_by>=...
+
+    dtypes are applied before writing; remaining text columns are stored as
+    strings so every file of a stage has the same schema. Writing the same
+    source and run date again replaces that snapshot.
+    """
+    run_date = str(run_date or date.today().isoformat())
+    df = df.copy()
+    if dtypes:
+        df = df.astype({column: dtype for column, dtype in dtypes.items() if column in df})
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].astype("string")
+
+    partition_by = [column for column in partition_by if column in df]
+    for column in partition_by:
+        df[column] = df[column].fillna("Unknown")
+    df["source"] = source
+    df["run_date"] = run_date
+
+    snapshot = _partition_dir(stage, source, run_date, root)
+    if os.path.exists(snapshot):
+        shutil.rmtree(snapshot)
+    pq.write_to_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        stage_path(stage, root),
+        partition_cols=[*PARTITION_COLUMNS, *partition_by],
+    )
+    return snapshot
+
+
+def read_stage(stage, source=None, run_date=None, columns=None, filters=None, root=DATA_ROOT):
+    """Read a stage back, loading only the requested columns.
+
+    source and run_date select partitions (run_date="latest" picks the most
+    recent date for the source); filters is a dict of column -> value or
+    list of values. Requested columns missing from older files are skipped.
+    """
+    path = stage_path(stage, root)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No '{stage}' data in {root}")
+    # Partition values are always read as text, even ones that look like numbers
+    partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+    dataset = ds.dataset(path, format="parquet", partitioning=partitioning)
+
+    filters = dict(filters or {})
+    if source is not None:
+        filters["source"] = source
+    if run_date == "latest":
+        run_date = latest_date(stage, source, root)
+    if run_date is not None:
+        filters["run_date"] = str(run_date)
+
+    expression = None
+    for column, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        condition = ds.field(column).isin([str(v) for v in values])
+        expression = condition if expression is None else expression & condition
+
+    if columns is not None:
+        columns = [column for column in columns if column in dataset.schema.names]
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    for column in df.columns[df.dtypes == "category"]:
+        if columns is None and df[column].isna().all():
+            # Partition level used only by other sources in the same stage
+            df = df.drop(columns=column)
+        else:
+            df[column] = df[column].astype("string")
+    return df
+
+
+def latest_date(stage, source, root=DATA_ROOT):
+    """Most recent date written for a source in a stage"""
+    source_dir = os.path.join(stage_path(stage, root), f"source={source}")
+    dates = sorted(name.split("=", 1)[1] for name in os.listdir(source_dir) if name.startswith("run_date="))
+    if not dates:
+        raise FileNotFoundError(f"No '{stage}' data for {source}")
+    return dates[-1]
+
+
+def export_report(df, output_file, force=False, **kwargs):
+    """Write the stage as .xlsx/.csv for people to open; skipped unless EXPORT_REPORTS or force"""
+    if not (EXPORT_REPORTS or force) or not output_file:
+        return None
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if output_file.endswith(".csv"):
+        df.to_csv(output_file, index=False)
+    else:
+        df.to_excel(output_file, index=False, **kwargs)
+    return output_file
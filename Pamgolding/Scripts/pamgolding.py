@@ -1,26 +1,54 @@
-from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-import time
-import random
+from bs4 import BeautifulSoup
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common import driver as driver_factory
+from Common.engine import BrowserFetcher, SiteAdapter, finalize_records, open_run, run_adapter, save_replay
+from Common.metrics import metrics
+
+BASE_URL = "https://www.pamgolding.co.za/property-search/apartments-to-rent-kenya/119"
+EXTRACT_IN_BROWSER = True  # Read all listings with one execute_script per page instead of per-field WebDriver calls
+
+# Same fields as scrape_single_page. innerText matches Selenium's .text, and
+# a listing missing its title, price, details or link is skipped there too.
+LISTINGS_JS = """
+const listings = [];
+for (const card of document.querySelectorAll('.pgp-property-content')) {
+    const title = card.querySelector('.pgp-description');
+    const price = card.querySelector('.pgp-price');
+    const description = card.querySelector('.pgp-details');
+    const link = card.querySelector('a');
+    if (!title || !price || !description || !link) continue;
+    const property = {
+        title: title.innerText.trim(),
+        price: price.innerText.trim(),
+        description: description.textContent.trim(),
+    };
+    for (const feature of card.querySelectorAll('.pgp-features > div')) {
+        const html = feature.innerHTML.toLowerCase();
+        const text = feature.innerText.trim();
+        if (html.includes('bedroom')) property.bedrooms = text;
+        else if (html.includes('bath')) property.bathrooms = text;
+        else if (html.includes('parking')) property.parking = text;
+    }
+    property.url = link.href;
+    listings.push(property);
+}
+return listings;
+"""
 
 def setup_driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-    
-    # Uncomment for headless mode
-    # options.add_argument('--headless')
-    
+    # Headless mode and resource blocking are configured in Common/driver.py
     service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    return driver
+    return driver_factory.setup_driver(service=service)
 
 def scrape_single_page(driver):
     properties = []
@@ -78,6 +106,52 @@ def scrape_single_page(driver):
     
     return properties
 
+def read_listings(driver):
+    """scrape_single_page in a single execute_script call"""
+    try:
+        with metrics.stage("wait"):
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_all_elements_located((By.CLASS_NAME, "pgp-property-content"))
+            )
+        return driver.execute_script(LISTINGS_JS) or []
+    except Exception as e:
+        print(f"Error scraping page: {e}")
+        return []
+
+def parse_listings_html(html):
+    """Same fields as scrape_single_page, read from saved page HTML instead of the live browser"""
+    properties = []
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(html, "html.parser")
+    for listing in soup.select(".pgp-property-content"):
+        title = listing.select_one(".pgp-description")
+        price = listing.select_one(".pgp-price")
+        description = listing.select_one(".pgp-details")
+        link = listing.find("a", href=True)
+        # Incomplete cards are skipped, as find_element raising skips them in scrape_single_page
+        if not (title and price and description and link):
+            continue
+        property_data = {
+            'title': title.get_text(" ", strip=True),
+            'price': price.get_text(" ", strip=True),
+            'description': description.get_text().strip(),
+        }
+
+        for feature in listing.select(".pgp-features > div"):
+            text = feature.get_text(" ", strip=True)
+            inner_html = feature.decode_contents().lower()
+            if "bedroom" in inner_html:
+                property_data['bedrooms'] = text
+            elif "bath" in inner_html:
+                property_data['bathrooms'] = text
+            elif "parking" in inner_html:
+                property_data['parking'] = text
+
+        href = link['href']
+        property_data['url'] = f"https://www.pamgolding.co.za{href}" if href.startswith('/') else href
+        properties.append(property_data)
+    return properties
+
 def handle_pagination(driver):
     try:
         # Wait for pagination to load
@@ -103,82 +177,99 @@ def handle_pagination(driver):
     
     return 1
 
-def scrape_all_pages(base_url, max_pages=40):
-    driver = setup_driver()
-    all_properties = []
-    
-    try:
-        driver.get(base_url)
-        time.sleep(3)  # Initial load wait
-        
+# ======================
+# SITE ADAPTER
+# ======================
+class PamGoldingAdapter(SiteAdapter):
+    name = "Pam Golding"
+    listing_selector = ".pgp-property-content"
+    rate_limits = (0.1, 1.0)  # Requests/s per host; the limiter adapts between these
+    output_file = "pam_golding_properties_all_pages.csv"
+    source = "pamgolding"
+    dtypes = dict.fromkeys(
+        ["title", "price", "description", "bedrooms", "bathrooms", "parking", "url", "scraped_on"], "string")
+    dedupe_fields = ("url",)  # Featured listings repeat across pages
+    date_field = "scraped_on"
+
+    def __init__(self, base_url=BASE_URL, max_pages=40):
+        self.base_url = base_url
+        self.max_pages = max_pages
+        self.total_pages = {}
+
+    def create_fetcher(self):
+        return BrowserFetcher(setup_driver())
+
+    def start_urls(self):
+        return [("Apartments to rent", self.base_url)]
+
+    def open_group(self, fetcher, group, url):
+        fetcher.get(url)
+        fetcher.wait_ready(self.listing_selector)
+
         # Get total pages if possible
-        total_pages = handle_pagination(driver)
-        
-        if total_pages is None:
-            # Use incremental navigation if we couldn't determine total pages
+        self.total_pages[group] = handle_pagination(fetcher.driver)
+        if self.total_pages[group] is None:
             print("Using incremental page navigation")
-            current_page = 1
-            while True:
-                print(f"Scraping page {current_page}")
-                page_properties = scrape_single_page(driver)
-                all_properties.extend(page_properties)
-                
-                # Try to find and click next button
-                try:
-                    next_button = driver.find_element(By.CSS_SELECTOR, ".pagination .next")
-                    if "disabled" in next_button.get_attribute("class"):
-                        break
-                    next_button.click()
-                    time.sleep(random.uniform(2, 4))
-                    current_page += 1
-                    
-                    if current_page > max_pages:
-                        print(f"Reached maximum page limit of {max_pages}")
-                        break
-                except:
-                    print("No more pages found")
-                    break
         else:
-            print(f"Found {total_pages} pages to scrape")
-            for page_num in range(1, min(total_pages, max_pages) + 1):
-                if page_num > 1:
-                    page_url = f"{base_url}/page{page_num}"
-                    driver.get(page_url)
-                    time.sleep(random.uniform(2, 4))
-                
-                print(f"Scraping page {page_num} of {total_pages}")
-                page_properties = scrape_single_page(driver)
-                all_properties.extend(page_properties)
-                time.sleep(random.uniform(1, 3))
-                
-    except Exception as e:
-        print(f"Error during scraping: {e}")
-    finally:
-        driver.quit()
-    
-    return all_properties
+            print(f"Found {self.total_pages[group]} pages to scrape")
+
+    def page_url(self, url, page):
+        return url if page == 1 else f"{url}/page{page}"
+
+    def next_page(self, fetcher, group, url, page):
+        total_pages = self.total_pages.get(group)
+        if total_pages is not None:
+            return page < total_pages and super().next_page(fetcher, group, url, page)
+
+        # Incremental navigation: click the next button until it is disabled
+        next_buttons = fetcher.driver.find_elements(By.CSS_SELECTOR, ".pagination .next")
+        if not next_buttons or "disabled" in next_buttons[0].get_attribute("class"):
+            return False
+        next_buttons[0].click()
+        return True
+
+    def extract_records(self, html, group, page_url):
+        # Used when replaying cached pages, which fills scraped_on with the fetch date; live pages are read
+        # from the browser
+        return parse_listings_html(html)
+
+    def extract_page(self, fetcher, group, html=None):
+        if EXTRACT_IN_BROWSER:
+            properties = read_listings(fetcher.driver)
+        else:
+            properties = scrape_single_page(fetcher.driver)
+        # Dates the prices, so they are converted at that day's exchange rate
+        scraped_on = date.today().isoformat()
+        for property_data in properties:
+            property_data['scraped_on'] = scraped_on
+        return properties
+
+    def page_html(self, fetcher):
+        return fetcher.listing_html(self.listing_selector) if EXTRACT_IN_BROWSER else fetcher.html()
+
+def scrape_all_pages(base_url, max_pages=40):
+    return run_adapter(PamGoldingAdapter(base_url, max_pages))
 
 def main():
-    base_url = "https://www.pamgolding.co.za/property-search/apartments-to-rent-kenya/119"
+    parser = argparse.ArgumentParser(description="Scrape Pam Golding rental listings")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-extract listings from the page cache instead of the website")
+    args = parser.parse_args()
+
+    adapter = PamGoldingAdapter(BASE_URL, max_pages=40)  # Set max_pages as needed
     
-    print(f"Starting scraping of Pam Golding properties from: {base_url}")
-    properties = scrape_all_pages(base_url, max_pages=40)  # Set max_pages as needed
+    if args.replay:
+        df = save_replay(adapter)
+    else:
+        print(f"Starting scraping of Pam Golding properties from: {adapter.base_url}")
+        sink, checkpoint = open_run(adapter)
+        run_adapter(adapter, sink=sink, checkpoint=checkpoint)
+        df = finalize_records(adapter, sink, checkpoint=checkpoint)
     
-    if properties:
-        df = pd.DataFrame(properties)
-        
-        # Save to CSV
-        csv_file = 'pam_golding_properties_all_pages.csv'
-        df.to_csv(csv_file, index=False)
-        
-        print(f"\nSuccessfully scraped {len(properties)} properties from all pages.")
-        print(f"Data saved to {csv_file}")
-        
+    if df is not None:
         # Print summary
         print("\nSample data:")
         print(df.head())
-    else:
-        print("No properties were scraped.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
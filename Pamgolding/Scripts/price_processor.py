@@ -1,90 +1,165 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
 import pandas as pd
-import re
-
-
-def extract_prices(price_str):
-    """Extract main price and bracketed price from string"""
-    if not isinstance(price_str, str):
-        return None, None
-        
-    # Extract main Rand price
-    rand_match = re.search(r'R([\d,]+)', price_str)
-    main_price = float(rand_match.group(1).replace(',', '')) if rand_match else None
-    
-    # Extract USD from brackets and convert to KSH
-    usd_match = re.search(r'\$\s*([\d,]+)', price_str)
-    if usd_match:
-        usd_amount = float(usd_match.group(1).replace(',', ''))
-        # Using current exchange rate (1 USD = 142.6 KSH)
-        bracket_price = usd_amount * 142.6
-    else:
-        bracket_price = None
-    
-    return main_price, bracket_price
-
-def extract_location(title):
-    """Extract location from title"""
-    if not isinstance(title, str):
-        return None
-    
-    # Get text in parentheses at the end
-    location_match = re.search(r'in\s+([^()]+)\s+\(([^)]+)\)$', title)
-    if location_match:
-        area = location_match.group(1).strip()
-        country = location_match.group(2).strip()
-        return f"{area}, {country}"
-    return None
-
-def process_properties(input_file, output_file):
-    """Process both prices and locations"""
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.fx import FX_RATES_FILE, get_fx_table
+from Common.history import record_prices
+from Common.storage import export_report, read_stage, write_stage
+
+# ======================
+# CONFIGURATION
+# ======================
+DATE_COLUMN = 'scraped_on'  # Listing date; prices are converted at that day's rate
+SOURCE = 'pamgolding'
+RAW_COLUMNS = ['title', 'price', 'description', 'bedrooms', 'bathrooms', 'parking', 'url', DATE_COLUMN]
+OUTPUT_FILE = "processed_properties.csv"  # Optional report
+PROCESSED_DTYPES = {
+    'Price_Rand': 'float64', 'Price_USD': 'float64', 'Price_KSH_Listed': 'float64',
+    'Price_KSH': 'float64', 'Price_Rand_KSH': 'float64',
+}
+
+# Patterns are applied column-wise with Series.str.extract
+RAND_PATTERN = r'R([\d,]+)'
+KSH_PATTERN = r'KSH([\d,]+)'
+USD_PATTERN = r'\$\s*([\d,]+)'
+# "... in <Area> (<Country>)" at the end of the title
+LOCATION_PATTERN = r'in\s+(?P<Area>[^()]+)\s*\((?P<Country>[^)]+)\)$'
+
+
+def _amount(prices, pattern):
+    """First amount matching pattern in every price string, as a float"""
+    digits = prices.str.extract(pattern, expand=False).str.replace(',', '', regex=False)
+    return pd.to_numeric(digits, errors='coerce')
+
+
+def extract_prices(prices):
+    """Price_Rand, Price_USD and Price_KSH_Listed as they appear in a column of price strings"""
+    prices = pd.Series(prices).where(lambda s: s.map(lambda value: isinstance(value, str)))
+    return pd.DataFrame({
+        'Price_Rand': _amount(prices, RAND_PATTERN),
+        'Price_USD': _amount(prices, USD_PATTERN),
+        'Price_KSH_Listed': _amount(prices, KSH_PATTERN),
+    })
+
+
+def extract_locations(titles):
+    """Location, Area and Country for a column of listing titles"""
+    titles = pd.Series(titles).where(lambda s: s.map(lambda value: isinstance(value, str)))
+    locations = titles.str.extract(LOCATION_PATTERN)
+    locations['Area'] = locations['Area'].str.strip()
+    locations['Country'] = locations['Country'].str.strip()
+    locations.insert(0, 'Location', locations['Area'] + ', ' + locations['Country'])
+    return locations
+
+
+def listing_dates(df, default_date):
+    """Listing date per row, falling back to default_date where it is unknown"""
+    dates = pd.to_datetime(df[DATE_COLUMN], errors='coerce') if DATE_COLUMN in df else pd.Series(pd.NaT, index=df.index)
+    return dates.fillna(pd.Timestamp(default_date))
+
+
+def reprice(df, default_date=None, fx=None):
+    """(Re)compute the KSH columns from the parsed amounts with the dated FX table.
+
+    Price_KSH is the listed KSH amount when there is one, otherwise the USD
+    amount converted at the listing date's rate. Price_Rand_KSH is the Rand
+    amount converted the same way. No price strings are parsed here.
+    """
+    fx = fx or get_fx_table()
+    df = df.copy()
+    dates = listing_dates(df, default_date or datetime.today())
+    df['Price_KSH'] = df['Price_KSH_Listed'].fillna(fx.to_base(df['Price_USD'], 'USD', dates))
+    df['Price_Rand_KSH'] = fx.to_base(df['Price_Rand'], 'ZAR', dates)
+    return df
+
+
+def process_frame(df, default_date=None, fx=None):
+    """Add price and location columns to scraped Pam Golding listings"""
+    df = df.copy()
+    prices = extract_prices(df['price'])
+    locations = extract_locations(df['title'])
+    for column in prices:
+        df[column] = prices[column].to_numpy()
+    for column in locations:
+        df[column] = locations[column].to_numpy()
+    return reprice(df, default_date, fx)
+
+
+def file_date(path):
+    """Last-modified date of a file, used for scrapes saved before listings were dated"""
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def print_summary(df):
+    print("\nSummary:")
+    print(f"Total properties processed: {len(df)}")
+    print(f"Properties with Rand prices: {df['Price_Rand'].notna().sum()}")
+    print(f"Properties with KSH prices: {df['Price_KSH'].notna().sum()}")
+    print(f"Unique locations found: {df['Location'].nunique()}")
+
+    print("\nUnique areas:")
+    for area in df['Area'].unique():
+        if pd.notna(area):
+            print(f"- {area}")
+
+def process_properties(input_file, output_file, fx_file=FX_RATES_FILE):
+    """Process both prices and locations of a scraped CSV file"""
     try:
         # Read CSV file
-        df = pd.read_csv(input_file)
-        
-        # Add new columns
-        df['Price_Rand'] = None
-        df['Price_KSH'] = None
-        df['Location'] = None
-        df['Area'] = None
-        df['Country'] = None
-        
-        # Process each row
-        for idx, row in df.iterrows():
-            # Process prices
-            rand_price, ksh_price = extract_prices(row['price'])
-            df.at[idx, 'Price_Rand'] = rand_price
-            df.at[idx, 'Price_KSH'] = ksh_price
-            
-            # Process location
-            location = extract_location(row['title'])
-            if location:
-                area, country = location.split(', ')
-                df.at[idx, 'Location'] = location
-                df.at[idx, 'Area'] = area
-                df.at[idx, 'Country'] = country
-        
+        df = process_frame(pd.read_csv(input_file), file_date(input_file), get_fx_table(fx_file))
+
         # Save processed data
         df.to_csv(output_file, index=False)
-        
+
         # Print summary
         print(f"✅ Processing complete! Results saved to {output_file}")
-        print("\nSummary:")
-        print(f"Total properties processed: {len(df)}")
-        print(f"Properties with prices: {df['Price_Rand'].notna().sum()}")
-        print(f"Unique locations found: {df['Location'].nunique()}")
-        
-        print("\nUnique areas:")
-        for area in df['Area'].unique():
-            if pd.notna(area):
-                print(f"- {area}")
-        
+        print_summary(df)
+
+    except Exception as e:
+        print(f"❌ Error processing data: {str(e)}")
+
+def process_stage(run_date, fx_file=FX_RATES_FILE):
+    """Process one day of raw listings from the Parquet store into the processed stage"""
+    try:
+        df = read_stage("raw", SOURCE, run_date, columns=RAW_COLUMNS)
+        df = process_frame(df, run_date, get_fx_table(fx_file))
+
+        snapshot = write_stage(df, "processed", SOURCE, run_date, dtypes=PROCESSED_DTYPES)
+        export_report(df, OUTPUT_FILE)
+        # Recorded here rather than at scrape time: the raw price string mixes Rand and KSH
+        record_prices(df, SOURCE, run_date, id_column='url', price_column='Price_KSH', name_column='title',
+                      url_column='url')
+
+        print(f"✅ Processing complete! Results saved to {snapshot}")
+        print_summary(df)
+
     except Exception as e:
         print(f"❌ Error processing data: {str(e)}")
 
+def reprice_file(processed_file, fx_file=FX_RATES_FILE):
+    """Update the KSH columns of an already processed file after the FX table changes"""
+    df = reprice(pd.read_csv(processed_file), file_date(processed_file), get_fx_table(fx_file))
+    df.to_csv(processed_file, index=False)
+    print(f"✅ Repriced {len(df)} properties in {processed_file}")
+
 if __name__ == "__main__":
-    # File paths
-    input_file = "pam_golding_properties_all_pages.csv"
-    output_file = "processed_properties.csv"
-    
-    # Process data
-    process_properties(input_file, output_file)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Parse Pam Golding prices and locations")
+    parser.add_argument("--date", default=datetime.today().strftime("%Y-%m-%d"),
+                        help="scrape date to process from the Parquet store (YYYY-MM-DD)")
+    parser.add_argument("--input", help="process this scraped CSV instead of the Parquet store")
+    parser.add_argument("--fx-rates", default=FX_RATES_FILE, help="dated FX table (CSV or Parquet)")
+    parser.add_argument("--reprice", nargs="+", metavar="PROCESSED_CSV",
+                        help="only recompute KSH prices in already processed files")
+    args = parser.parse_args()
+
+    if args.reprice:
+        for processed_file in args.reprice:
+            reprice_file(processed_file, args.fx_rates)
+    elif args.input:
+        process_properties(args.input, OUTPUT_FILE, args.fx_rates)
+    else:
+        process_stage(args.date, args.fx_rates)
@@ -1,24 +1,21 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
-import random
 from urllib.parse import urlparse, urljoin
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from Common.driver import setup_driver
+from Common.changes import ChangeTracker
+from Common.engine import BrowserFetcher, SiteAdapter, finalize_records, open_run, run_adapter, save_replay
+from Common.metrics import metrics
+from Common.rate_limit import MAX_RATE, MIN_RATE
+
+BASE_URL = "https://www.propertypro.co.ke"
 
 def configure_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
-    
-    service = Service()
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return setup_driver()
 
 def is_url_allowed(url):
     """Check if URL is allowed by robots.txt"""
@@ -213,70 +210,83 @@ def extract_property_data(listing, base_url):
 
     return property_data
 
-def scrape_property_listings(max_pages=100, delay_range=(5, 10)):
-    driver = configure_driver()
-    all_properties = []
-    base_url = "https://www.propertypro.co.ke"
-    
-    try:
-        for page in range(1, max_pages + 1):
-            # Construct URL
-            if page == 1:
-                url = f"{base_url}/property-for-rent"
-            else:
-                url = f"{base_url}/property-for-rent/?page={page}"
-            
-            if not is_url_allowed(url):
-                print(f"Skipping potentially disallowed URL: {url}")
-                continue
-            
-            print(f"Scraping page {page}...")
-            driver.get(url)
-            
-            # Wait for listings to load
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "popular-block")))
-            
-            # Respectful delay
-            delay = random.uniform(*delay_range)
-            print(f"Waiting {delay:.1f} seconds to be polite...")
-            time.sleep(delay)
-            
-            # Parse page
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            listings = soup.find_all('div', class_='popular-block')
-            
-            for listing in listings:
-                property_data = extract_property_data(listing, base_url)
-                all_properties.append(property_data)
-            
-            print(f"Found {len(listings)} listings on page {page}")
-            
-    except Exception as e:
-        print(f"Error occurred: {e}")
-    finally:
-        driver.quit()
-    
-    return all_properties
+class PropertyProAdapter(SiteAdapter):
+    name = "PropertyPro"
+    listing_selector = "div.popular-block"
+    output_file = "propertypro_detailed_listings.csv"
+    source = "propertypro"
+    dtypes = dict.fromkeys(["title", "price", "location", "url", "image_url"], "string")
+    price_history = {"id_column": "url", "price_column": "price", "name_column": "title", "url_column": "url"}
+    dedupe_fields = ("url",)  # Featured listings repeat across pages
 
-# Execute scraping
-properties = scrape_property_listings(max_pages=100, delay_range=(5, 10))
+    def __init__(self, max_pages=100, rate_limits=(MIN_RATE, MAX_RATE)):
+        self.max_pages = max_pages
+        self.rate_limits = rate_limits  # Requests/s floor and ceiling; the pace adapts to the server in between
 
-# Process and save results
-if properties:
-    df = pd.DataFrame(properties)
-    
-    # Clean data
-    for col in ['location', 'description', 'dates_info']:
-        if col in df.columns:
-            df[col] = df[col].str.replace('\s+', ' ', regex=True)
-    
-    print(f"\nTotal properties scraped: {len(df)}")
-    print("\nSample data:")
-    print(df.head(3).to_markdown(index=False))
+    def create_fetcher(self):
+        return BrowserFetcher(configure_driver())
+
+    def start_urls(self):
+        return [("Property for rent", f"{BASE_URL}/property-for-rent")]
+
+    def page_url(self, url, page):
+        return url if page == 1 else f"{BASE_URL}/property-for-rent/?page={page}"
+
+    def next_page(self, fetcher, group, url, page):
+        # Past the last page the listing selector never appears, so each extra page would cost a full readiness
+        # timeout; stop on a page without listings or without a link to the following page
+        if not fetcher.listing_texts(self.listing_selector):
+            return False
+        if not fetcher.listing_texts(f'a[href*="page={page + 1}"]'):
+            return False
+        next_url = self.page_url(url, page + 1)
+        if not is_url_allowed(next_url):
+            print(f"Skipping potentially disallowed URL: {next_url}")
+            return False
+        fetcher.get(next_url)
+        return True
+
+    def extract_records(self, html, group, page_url):
+        with metrics.stage("parse"):
+            soup = BeautifulSoup(html, 'html.parser')
+        return [extract_property_data(listing, BASE_URL) for listing in soup.find_all('div', class_='popular-block')]
+
+    def to_frame(self, records):
+        df = pd.DataFrame(records)
+        
+        # Clean data
+        for col in ['location', 'description', 'dates_info']:
+            if col in df.columns:
+                df[col] = df[col].str.replace(r'\s+', ' ', regex=True)
+        return df
+
+def scrape_property_listings(max_pages=100, rate_limits=(MIN_RATE, MAX_RATE), changes=None):
+    """Listings from every page; with a ChangeTracker only those on pages changed since the last run"""
+    return run_adapter(PropertyProAdapter(max_pages, rate_limits), changes=changes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape PropertyPro rental listings")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="skip pages unchanged since the last run and store only new/removed/repriced listings")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-extract listings from the page cache instead of the website")
+    args = parser.parse_args()
+
+    adapter = PropertyProAdapter(max_pages=100)
+    changes = None
+    if args.replay:
+        df = save_replay(adapter)
+    else:
+        sink, checkpoint = open_run(adapter, changes_only=args.changes_only)  # Resumes a run that stopped part-way
+        changes = ChangeTracker.for_adapter(adapter, resume=checkpoint.resuming) if args.changes_only else None
+        run_adapter(adapter, sink=sink, checkpoint=checkpoint, changes=changes)
+        df = finalize_records(adapter, sink, checkpoint=checkpoint, changes=changes)
     
-    # Save to CSV
-    df.to_csv('propertypro_detailed_listings.csv', index=False)
-    print("\nData saved to propertypro_detailed_listings.csv")
-else:
-    print("No properties were scraped.")
\ No newline at end of file
+    # Process and save results
+    if df is not None:
+        print(f"\nTotal properties scraped: {len(df)}")
+        print("\nSample data:")
+        print(df.head(3).to_markdown(index=False))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
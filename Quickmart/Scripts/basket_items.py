@@ -1,51 +1,67 @@
+import argparse
+import os
+import sys
 import pandas as pd
-from fuzzywuzzy import fuzz
 from datetime import datetime
 
+from cpi_matcher import BRANDS_TO_IGNORE, CACHE_FILE, MATCH_THRESHOLD, NO_MATCH, WORKERS, CPIMatcher, MatchCache
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.history import PriceHistory, stable_ids
+from Common.storage import export_report, read_stage, write_stage
+
 today_str = datetime.today().strftime("%d-%m-%Y")
 
-# Load datasets
-products_df = pd.read_excel(f"Quickmart/Quickmart Data/Categorized Data/categorized_products_{today_str}.xlsx")
-cpi_basket_df = pd.read_excel("CPI basket.xlsx", sheet_name="Basket")
-
-# Preprocess CPI basket items
-cpi_items = cpi_basket_df["Elementary aggregate"].str.lower().unique().tolist()
-
-# Common brand names to ignore (add more as needed)
-brands_to_ignore = ['copia', 'mika', 'nestle', 'brookside', 'tusker', 'guinness', 'pishori', 'basmati']
-
-def clean_text(text):
-    """Remove brands and special characters for better matching"""
-    text = str(text).lower()
-    for brand in brands_to_ignore:
-        text = text.replace(brand, '')
-    return ''.join(c for c in text if c.isalnum() or c.isspace())
-
-def is_likely_match(product_name, threshold=65):
-    """Check if product likely matches any CPI item using fuzzy matching"""
-    cleaned_product = clean_text(product_name)
-    for cpi_item in cpi_items:
-        if fuzz.token_set_ratio(cleaned_product, clean_text(cpi_item)) >= threshold:
-            return True
-    return False
-
-# Apply filtering
-filtered_df = products_df[products_df["product_name"].apply(is_likely_match)].copy()
-
-# Add matched CPI item for verification
-def get_matched_item(product_name, threshold=65):
-    cleaned_product = clean_text(product_name)
-    matches = []
-    for cpi_item in cpi_items:
-        score = fuzz.token_set_ratio(cleaned_product, clean_text(cpi_item))
-        if score >= threshold:
-            matches.append((cpi_item, score))
-    return max(matches, key=lambda x: x[1])[0] if matches else "No clear match"
-
-filtered_df["Matched CPI Item"] = filtered_df["product_name"].apply(get_matched_item)
-
-# Save results
-filtered_df.to_excel(f"Quickmart/Quickmart Data/Filtered Data/Quickmart_{today_str}.xlsx", index=False, sheet_name="Quickmart")
-
-print(f"Filtered {len(filtered_df)}/{len(products_df)} products likely in CPI basket")
-print(f"Results saved to 'Quickmart_{today_str}.xlsx'")
\ No newline at end of file
+# ======================
+# CONFIGURATION
+# ======================
+SOURCE = "quickmart"
+# Columns read from the categorized stage; the rest are never loaded
+PRODUCT_COLUMNS = ["description", "product_name", "quantity", "unit", "base_quantity", "base_unit",
+                   "category", "price", "Product_Category"]
+CPI_BASKET_FILE = "CPI basket.xlsx"
+OUTPUT_FILE = f"Quickmart/Quickmart Data/Filtered Data/Quickmart_{today_str}.xlsx"  # Optional report
+
+
+def load_cpi_items(basket_file=CPI_BASKET_FILE):
+    """Lowercased, de-duplicated CPI basket items"""
+    cpi_basket_df = pd.read_excel(basket_file, sheet_name="Basket")
+    return cpi_basket_df["Elementary aggregate"].str.lower().unique().tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match Quickmart products to CPI basket items")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="processes used for fuzzy matching (1 = serial)")
+    parser.add_argument("--date", default=datetime.today().strftime("%Y-%m-%d"),
+                        help="scrape date to match (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    # Load datasets
+    products_df = read_stage("categorized", SOURCE, args.date, columns=PRODUCT_COLUMNS)
+    matcher = CPIMatcher(load_cpi_items(), threshold=MATCH_THRESHOLD, brands_to_ignore=BRANDS_TO_IGNORE)
+
+    # Best CPI item and score for every product in one pass, reusing earlier days' matches
+    with MatchCache(CACHE_FILE, matcher.fingerprint) as cache:
+        matches = matcher.match(products_df["product_name"], cache=cache, workers=args.workers)
+
+    # Keep products that likely match a CPI item
+    filtered_df = products_df[matches["matched_item"].notna()].copy()
+    filtered_df["Matched CPI Item"] = matches["matched_item"].fillna(NO_MATCH)
+    filtered_df["Match Score"] = matches["score"]
+
+    # Save results
+    snapshot = write_stage(filtered_df, "matched", SOURCE, args.date, partition_by=("category",),
+                           dtypes={"Match Score": "int64"})
+    export_report(filtered_df, OUTPUT_FILE, sheet_name="Quickmart")
+
+    # Tag products in the price history so CPI items can be followed over time
+    with PriceHistory() as history:
+        history.set_cpi_items(stable_ids(SOURCE, filtered_df["description"]), filtered_df["Matched CPI Item"])
+
+    print(f"Filtered {len(filtered_df)}/{len(products_df)} products likely in CPI basket")
+    print(f"Results saved to '{snapshot}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,94 @@
+import argparse
+import os
+import sys
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.storage import export_report, read_stage, write_stage
+
+# ======================
+# CONFIGURATION
+# ======================
+today_str = datetime.today().strftime("%d-%m-%Y")
+today_iso = datetime.today().strftime("%Y-%m-%d")
+SOURCE = "quickmart"
+RAW_COLUMNS = ["category", "name", "price"]  # Only these are read from the raw stage
+PRODUCT_DTYPES = {
+    'description': 'string', 'product_name': 'string', 'quantity': 'string', 'unit': 'string',
+    'base_quantity': 'float64', 'base_unit': 'string', 'category': 'string', 'price': 'string',
+}
+
+QUANTITY_PATTERN = r'(?i)(\d+(?:\.\d+)?)\s*(ml|l|g|kg|pcs|pack|pieces|grams|kilos)'
+
+# Everything before the first quantity, the quantity and its unit, in one pass
+PRODUCT_DETAILS_PATTERN = re.compile(
+    r'(?is)^(?P<product_name>.*?)\s*(?P<quantity>\d+(?:\.\d+)?)\s*(?P<unit>ml|l|g|kg|pcs|pack|pieces|grams|kilos)'
+)
+
+# (category, keyword pattern, priority). A product goes to the category with the
+# most keyword hits; ties go to the higher priority.
+CATEGORY_RULES = [
+    ('Beverages', ('juice', 'water', 'soda', 'tea', 'coffee', 'drink', 'milk', 'yoghurt'), 1),
+    ('Snacks', ('chips', 'crisps', 'biscuits', 'chocolate', 'candy', 'sweets', 'cookies'), 2),
+    ('Household', ('cleaner', 'detergent', 'soap', 'tissue', 'towel', 'brush'), 3),
+    ('Personal Care', ('shampoo', 'toothpaste', 'deodorant', 'lotion', 'cream'), 4),
+    ('Fresh Produce', ('fruits', 'vegetables', 'meat', 'fish', 'chicken'), 5),
+    ('Groceries', ('rice', 'flour', 'sugar', 'oil', 'pasta', 'bread'), 6),
+    ('Electronics', ('battery', 'charger', 'cable', 'headphone', 'speaker'), 7),
+    ('Home Care', ('mop', 'broom', 'bucket', 'trash', 'bin', 'cleaning'), 8),
+]
+DEFAULT_CATEGORY = 'Other'
+
+# unit -> (base unit, multiplier into the base unit)
+UNIT_CONVERSIONS = {
+    'ML': ('L', 0.001),
+    'L': ('L', 1),
+    'G': ('KG', 0.001),
+    'GRAMS': ('KG', 0.001),
+    'KG': ('KG', 1),
+    'KILOS': ('KG', 1),
+    'PCS': ('PCS', 1),
+    'PIECES': ('PCS', 1),
+    'PACK': ('PCS', 1),
+}
+BASE_UNITS = pd.Series({unit: base for unit, (base, _) in UNIT_CONVERSIONS.items()})
+UNIT_MULTIPLIERS = pd.Series({unit: factor for unit, (_, factor) in UNIT_CONVERSIONS.items()})
+
+
+def extract_product_details(names):
+    """Vectorized split of a name column into product_name, quantity, unit and description.
+
+    Same result as split_product_details row by row, plus base_quantity and
+    base_unit with ML/G converted to L/KG so sizes can be compared.
+    """
+    names = pd.Series(names)
+    is_text = names.map(lambda name: isinstance(name, str))
+    text = names.where(is_text)
+
+    details = text.str.extract(PRODUCT_DETAILS_PATTERN)
+    matched = details['quantity'].notna()
+    details['product_name'] = details['product_name'].str.strip().where(matched, text)
+    details['unit'] = details['unit'].str.upper()
+    details['description'] = text
+
+    details['base_unit'] = details['unit'].map(BASE_UNITS)
+    details['base_quantity'] = pd.to_numeric(details['quantity']) * details['unit'].map(UNIT_MULTIPLIERS)
+
+    details = details[['product_name', 'quantity', 'unit', 'description', 'base_quantity', 'base_unit']]
+    return details.astype({'product_name': object, 'quantity': object, 'unit': object, 'description': object,
+                           'base_unit': object}).where(details.notna(), None)
+
 def split_product_details(full_name):
-    """Split product name into base name and quantity while preserving original name as description"""
+    """Split product name into base name and quantity while preserving original name as description.
+    Row-by-row version; process_products uses extract_product_details on the whole column."""
     if not isinstance(full_name, str):
         return pd.Series({'product_name': None, 'quantity': None, 'unit': None, 'description': None})
 
@@ -11,7 +96,7 @@ def split_product_details(full_name):
     description = full_name
     
     # Pattern to match quantity with units
-    quantity_pattern = r'(?i)(\d+(?:\.\d+)?)\s*(ml|l|g|kg|pcs|pack|pieces|grams|kilos)'
+    quantity_pattern = QUANTITY_PATTERN
     
     # Try to find quantity in the name
     quantity_match = re.search(quantity_pattern, full_name)
@@ -38,12 +123,77 @@ def split_product_details(full_name):
         'description': description
     })
 
-def categorize_products(input_file):
+class CategoryClassifier:
+    """Assigns every product a category in one scan, whatever the number of categories.
+
+    All keywords go into a single Aho-Corasick automaton when pyahocorasick
+    is installed, or one combined regex otherwise. Both take the leftmost,
+    longest keyword at each position, so they report the same hits.
+    """
+
+    def __init__(self, rules=CATEGORY_RULES, default=DEFAULT_CATEGORY):
+        self.categories = [category for category, _, _ in rules]
+        self.priorities = pd.Series([priority for _, _, priority in rules], index=self.categories)
+        self.default = default
+        self.keyword_category = {
+            keyword.lower(): i for i, (_, keywords, _) in enumerate(rules) for keyword in keywords
+        }
+
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword, i in self.keyword_category.items():
+                self.automaton.add_word(keyword, i)
+            self.automaton.make_automaton()
+        else:
+            self.automaton = None
+            keywords = sorted(self.keyword_category, key=len, reverse=True)
+            self.pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+    def _matches(self, name):
+        """Category index of every keyword hit in a lowercased name"""
+        if self.automaton is not None:
+            return [i for _, i in self.automaton.iter_long(name)]
+        return [self.keyword_category[match.group()] for match in self.pattern.finditer(name)]
+
+    def hit_counts(self, names):
+        """Keyword hits per product (rows) and category (columns)"""
+        width = len(self.categories)
+        cells = [
+            row * width + i
+            for row, name in enumerate(names.str.lower().tolist()) if isinstance(name, str)
+            for i in self._matches(name)
+        ]
+        hits = np.bincount(np.array(cells, dtype=np.int64), minlength=len(names) * width)
+        return pd.DataFrame(hits.reshape(len(names), width), index=names.index, columns=self.categories)
+
+    def classify(self, names):
+        """(category per product, hit counts)"""
+        hits = self.hit_counts(names)
+        counts = hits.to_numpy()
+        priorities = self.priorities.to_numpy()
+        # Hit count dominates; priority only separates ties
+        scores = counts * (priorities.max() + 1) + (counts > 0) * priorities
+        best = np.array(self.categories, dtype=object)[scores.argmax(axis=1)]
+        categories = pd.Series(np.where(counts.any(axis=1), best, self.default), index=names.index)
+        return categories, hits
+
+    def summary(self, categories, hits):
+        """Per-category hit counts next to how many products were assigned"""
+        return pd.DataFrame({
+            'products_hit': (hits > 0).sum(),
+            'keyword_hits': hits.sum(),
+            'assigned': categories.value_counts().reindex(self.categories, fill_value=0),
+        })
+
+def load_raw_products(run_date=None, input_file=None):
+    """Raw scraped products from the Parquet store, or from an old .xlsx export"""
+    if input_file:
+        return pd.read_excel(input_file)
+    return read_stage("raw", SOURCE, run_date or today_iso, columns=RAW_COLUMNS)
+
+def categorize_products(df, run_date=None):
     """Categorize Quickmart products based on their names and descriptions"""
     try:
-        # Read the Excel file
-        df = pd.read_excel(input_file)
-
         # Verify column names in the DataFrame
         print("Available columns:", df.columns.tolist())
 
@@ -51,60 +201,52 @@ def categorize_products(input_file):
         df_processed = df.copy()
         df_processed.columns = df_processed.columns.str.lower()
 
-        # Create category mapping
-        category_mapping = {
-            'Beverages': r'(juice|water|soda|tea|coffee|drink|milk|yoghurt)',
-            'Snacks': r'(chips|crisps|biscuits|chocolate|candy|sweets|cookies)',
-            'Household': r'(cleaner|detergent|soap|tissue|towel|brush)',
-            'Personal Care': r'(shampoo|toothpaste|deodorant|lotion|cream)',
-            'Fresh Produce': r'(fruits|vegetables|meat|fish|chicken)',
-            'Groceries': r'(rice|flour|sugar|oil|pasta|bread)',
-            'Electronics': r'(battery|charger|cable|headphone|speaker)',
-            'Home Care': r'(mop|broom|bucket|trash|bin|cleaning)'
-        }
-
-        # Add new category column
-        df_processed['Product_Category'] = 'Other'
-
-        # Categorize products based on name
-        for category, pattern in category_mapping.items():
-            mask = df_processed['name'].str.lower().str.contains(pattern, regex=True, na=False)
-            df_processed.loc[mask, 'Product_Category'] = category
+        # Categorize products based on name in a single scan
+        names = df_processed['name'] if 'name' in df_processed else df_processed['description']
+        classifier = CategoryClassifier()
+        df_processed['Product_Category'], hits = classifier.classify(names)
 
         # Save categorized data
-        output_file = input_file.replace('.xlsx', '_categorized.xlsx')
-        df_processed.to_excel(output_file, index=False)
+        snapshot = write_stage(df_processed, "categorized", SOURCE, run_date or today_iso,
+                               partition_by=("category",), dtypes=PRODUCT_DTYPES)
+        export_report(df_processed, f"Quickmart/Quickmart Data/Categorized Data/categorized_products_{today_str}.xlsx")
         
         # Print summary
         print("\nCategorization Summary:")
         print(df_processed['Product_Category'].value_counts())
-        print(f"\n✅ Categorized data saved to: {output_file}")
+        print("\nKeyword hits per category:")
+        print(classifier.summary(df_processed['Product_Category'], hits).to_string())
+        print(f"Products matching more than one category: {((hits > 0).sum(axis=1) > 1).sum()}")
+        print(f"\n✅ Categorized data saved to: {snapshot}")
+        return df_processed
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")
-        print("DataFrame columns:", df.columns.tolist() if 'df' in locals() else "DataFrame not loaded")
+        print("DataFrame columns:", df.columns.tolist())
 
-def process_products(input_file):
+def process_products(df, run_date=None):
     """Process Quickmart products to split name components"""
     try:
-        # Read the Excel file
-        df = pd.read_excel(input_file)
         print("Original columns:", df.columns.tolist())
         
-        # Split the name column into components
-        split_df = df['name'].apply(split_product_details)
+        # Split the name column into components in a single vectorized pass
+        split_df = extract_product_details(df['name'])
+        split_df.index = df.index
         
         # Combine with original dataframe, excluding original name column
         result_df = pd.concat([df.drop('name', axis=1), split_df], axis=1)
         
         # Reorder columns to put description first
         cols = result_df.columns.tolist()
-        cols = ['description', 'product_name', 'quantity', 'unit'] + [col for col in cols if col not in ['description', 'product_name', 'quantity', 'unit']]
+        leading = ['description', 'product_name', 'quantity', 'unit', 'base_quantity', 'base_unit']
+        cols = leading + [col for col in cols if col not in leading]
         result_df = result_df[cols]
         
         # Save processed data
-        output_file = f"Quickmart/Quickmart Data/Categorized Data/Quickmart_{today_str}.xlsx"
-        result_df.to_excel(output_file, sheet_name='Quickmart', index=False)
+        snapshot = write_stage(result_df, "processed", SOURCE, run_date or today_iso,
+                               partition_by=("category",), dtypes=PRODUCT_DTYPES)
+        export_report(result_df, f"Quickmart/Quickmart Data/Categorized Data/Quickmart_{today_str}.xlsx",
+                      sheet_name='Quickmart')
          
         # Print summary with examples
         print("\nProcessing Summary:")
@@ -115,13 +257,19 @@ def process_products(input_file):
         sample = result_df[['description', 'product_name', 'quantity']].head(3)
         print(sample.to_string())
         
-        print(f"\n✅ Processed data saved to: {output_file}")
+        print(f"\n✅ Processed data saved to: {snapshot}")
+        return result_df
 
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
 if __name__ == "__main__":
-    today_str = datetime.today().strftime("%d-%m-%Y")
-    input_file = f"Quickmart/Quickmart Data/Raw Data/Quickmart_raw_{today_str}.xlsx"
-    process_products(input_file)
-    categorize_products(input_file)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Split and categorize scraped Quickmart products")
+    parser.add_argument("--date", default=today_iso, help="scrape date to process (YYYY-MM-DD)")
+    parser.add_argument("--input", help="read raw products from this .xlsx instead of the Parquet store")
+    args = parser.parse_args()
+
+    raw_df = load_raw_products(args.date, args.input)
+    processed_df = process_products(raw_df, args.date)
+    if processed_df is not None:
+        categorize_products(processed_df, args.date)
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+# ======================
+# CONFIGURATION
+# ======================
+MATCH_THRESHOLD = 65  # Minimum token_set_ratio for a product to count as a CPI item
+NGRAM_SIZE = 3
+MIN_SHARED_NGRAMS = 2  # Character n-grams an item must share with a product to be scored
+NO_MATCH = "No clear match"
+CACHE_FILE = "Data Store/cpi_match_cache.sqlite"  # Matches reused across daily runs
+WORKERS = 1  # Processes used for matching (1 = serial)
+CHUNK_SIZE = 2000  # Product names per task in parallel mode
+
+# Common brand names to ignore (add more as needed)
+BRANDS_TO_IGNORE = ['copia', 'mika', 'nestle', 'brookside', 'tusker', 'guinness', 'pishori', 'basmati']
+
+
+def clean_text(text, brands_to_ignore=BRANDS_TO_IGNORE):
+    """Remove brands and special characters for better matching"""
+    text = str(text).lower()
+    for brand in brands_to_ignore:
+        text = text.replace(brand, '')
+    return ''.join(c for c in text if c.isalnum() or c.isspace())
+
+
+def ngrams(text, size=NGRAM_SIZE):
+    """Character n-grams of each token, padded so short tokens still produce one"""
+    grams = set()
+    for token in text.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+    return grams
+
+
+class CPIMatcher:
+    """Best CPI basket item and score for each product name.
+
+    The basket is cleaned and indexed once: an inverted index maps every
+    token and character n-gram to the items containing it. A product is only
+    scored against items sharing a token or at least MIN_SHARED_NGRAMS
+    n-grams with it, and each distinct product name is scored once.
+    """
+
+    def __init__(self, cpi_items, threshold=MATCH_THRESHOLD, brands_to_ignore=BRANDS_TO_IGNORE,
+                 min_shared_ngrams=MIN_SHARED_NGRAMS):
+        self.items = list(dict.fromkeys(cpi_items))
+        self.threshold = threshold
+        self.brands_to_ignore = brands_to_ignore
+        self.min_shared_ngrams = min_shared_ngrams
+        self.cleaned_items = [clean_text(item, brands_to_ignore) for item in self.items]
+
+        self.token_index = defaultdict(set)
+        self.ngram_index = defaultdict(list)
+        for i, cleaned in enumerate(self.cleaned_items):
+            for token in cleaned.split():
+                self.token_index[token].add(i)
+            for gram in ngrams(cleaned):
+                self.ngram_index[gram].append(i)
+
+    def candidates(self, cleaned):
+        """Indexes of the basket items worth scoring against a cleaned product name"""
+        found = set()
+        for token in cleaned.split():
+            found.update(self.token_index.get(token, ()))
+
+        shared = defaultdict(int)
+        for gram in ngrams(cleaned):
+            for i in self.ngram_index.get(gram, ()):
+                shared[i] += 1
+        found.update(i for i, count in shared.items() if count >= self.min_shared_ngrams)
+        # Basket order, so ties go to the earlier item as in a full sweep
+        return sorted(found)
+
+    @property
+    def fingerprint(self):
+        """Hash of everything that decides a match: basket items, ignored brands and thresholds"""
+        settings = [self.items, list(self.brands_to_ignore), self.threshold, self.min_shared_ngrams, NGRAM_SIZE]
+        return hashlib.sha256(json.dumps(settings, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def best_match(self, product_name):
+        """(CPI item, score) for one product, or (None, 0) below the threshold"""
+        return self.best_cleaned_match(clean_text(product_name, self.brands_to_ignore))
+
+    def best_cleaned_match(self, cleaned):
+        best, best_score = None, 0
+        for i in self.candidates(cleaned):
+            # Compared as fuzzywuzzy's integer scores, so ties go to the earlier basket item
+            score = int(round(fuzz.token_set_ratio(cleaned, self.cleaned_items[i])))
+            if score > best_score:
+                best, best_score = i, score
+        if best is None or best_score < self.threshold:
+            return None, 0
+        return self.items[best], best_score
+
+    def match(self, product_names, cache=None, workers=WORKERS):
+        """DataFrame with the best CPI item and its score for every product name.
+
+        Names are matched once per distinct cleaned form. With a MatchCache,
+        only cleaned names it has not seen under this matcher's settings go
+        through the matcher. With workers > 1 those names are matched in
+        chunks across a process pool; the result is the same as the serial run.
+        """
+        names = pd.Series(product_names)
+        cleaned = {name: clean_text(name, self.brands_to_ignore) for name in names.dropna().unique()}
+        unique_cleaned = list(dict.fromkeys(cleaned.values()))
+
+        best = cache.get_many(unique_cleaned) if cache is not None else {}
+        missing = [name for name in unique_cleaned if name not in best]
+        new_matches = dict(zip(missing, self._match_cleaned(missing, workers)))
+        if cache is not None:
+            cache.put_many(new_matches)
+            print(f"🗃 Match cache: {len(best)} names reused, {len(new_matches)} matched")
+        best.update(new_matches)
+
+        matches = [best[cleaned[name]] if name in cleaned else (None, 0) for name in names]
+        return pd.DataFrame(matches, columns=["matched_item", "score"], index=names.index)
+
+    def _match_cleaned(self, cleaned_names, workers):
+        if workers <= 1 or len(cleaned_names) <= CHUNK_SIZE:
+            return [self.best_cleaned_match(name) for name in cleaned_names]
+
+        chunks = [cleaned_names[i:i + CHUNK_SIZE] for i in range(0, len(cleaned_names), CHUNK_SIZE)]
+        # The matcher and its index are sent to each worker once, not with every chunk
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+            # map keeps chunk order, so results line up with cleaned_names
+            return [match for chunk in pool.map(_match_chunk, chunks) for match in chunk]
+
+    def match_exhaustive(self, product_names, workers=-1):
+        """Score every product against every item in one batched cdist call, without blocking"""
+        names = pd.Series(product_names)
+        cleaned = [clean_text(name, self.brands_to_ignore) for name in names.fillna("")]
+        scores = process.cdist(cleaned, self.cleaned_items, scorer=fuzz.token_set_ratio, dtype=np.float64,
+                               workers=workers)
+        # Rounded before picking, so ties go to the earlier basket item (argmax takes the first)
+        scores = np.round(scores).astype(int)
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(cleaned)), best] if len(cleaned) else np.array([], dtype=int)
+        matched = [self.items[i] if score >= self.threshold else None for i, score in zip(best, best_scores)]
+        best_scores = np.where(best_scores >= self.threshold, best_scores, 0)
+        return pd.DataFrame({"matched_item": matched, "score": best_scores}, index=names.index)
+
+
+_worker_matcher = None
+
+
+def _init_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_chunk(cleaned_names):
+    return [_worker_matcher.best_cleaned_match(name) for name in cleaned_names]
+
+
+class MatchCache:
+    """SQLite store of cleaned product name -> (CPI item, score) for one matcher fingerprint.
+
+    Rows written under any other fingerprint are dropped when the cache is
+    opened, so editing the basket sheet, the ignored brands or the threshold
+    starts a fresh cache.
+    """
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            "fingerprint TEXT NOT NULL, name TEXT NOT NULL, matched_item TEXT, score INTEGER NOT NULL, "
+            "PRIMARY KEY (fingerprint, name))"
+        )
+        stale = self.conn.execute("DELETE FROM matches WHERE fingerprint != ?", (fingerprint,)).rowcount
+        if stale:
+            print(f"♻️ CPI basket settings changed - dropped {stale} cached matches")
+        self.conn.commit()
+
+    def get_many(self, names, chunk_size=500):
+        found = {}
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            rows = self.conn.execute(
+                f"SELECT name, matched_item, score FROM matches "
+                f"WHERE fingerprint = ? AND name IN ({','.join('?' * len(chunk))})",
+                [self.fingerprint, *chunk],
+            )
+            found.update((name, (matched_item, score)) for name, matched_item, score in rows)
+        return found
+
+    def put_many(self, matches):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO matches (fingerprint, name, matched_item, score) VALUES (?, ?, ?, ?)",
+            [(self.fingerprint, name, matched_item, score) for name, (matched_item, score) in matches.items()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,13 +1,19 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
-import pandas as pd
+import argparse
 import time
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.engine import (BrowserFetcher, SiteAdapter, finalize_records, open_run, run_adapter, save_replay,
+                           scrape_group)
+from Common.metrics import metrics
+from Common.readiness import products_signature, wait_until_ready
+from product_parser import PRODUCT_SELECTOR, parse_products, read_products
 
 # ======================
 # CONFIGURATION
@@ -22,17 +28,7 @@ PAGE_LOAD_DELAY = 3
 MAX_PAGES = 40
 DEBUG_SCREENSHOTS = True
 SCREENSHOT_DIR = "debug_screenshots"
-
-# ======================
-# SETUP SELENIUM DRIVER
-# ======================
-def setup_driver():
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    driver = webdriver.Chrome(options=options)
-    return driver
+EXTRACT_IN_BROWSER = True  # Read product cards with one execute_script per page instead of parsing page_source
 
 # ======================
 # UTILITY FUNCTIONS
@@ -67,7 +63,7 @@ def accept_store_modal(driver):
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue')]")))
             driver.execute_script("arguments[0].click();", continue_btn)
             print("✅ Clicked 'Continue' on store modal")
-            time.sleep(2)
+            wait_until_ready(driver, baseline=2, label="store modal")
             return True
         except:
             print("⚠️ Couldn't find continue button - trying alternative approach")
@@ -77,18 +73,16 @@ def accept_store_modal(driver):
             store_select = WebDriverWait(driver, 5).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".store-selector")))
             store_select.click()
-            time.sleep(1)
             
             first_store = WebDriverWait(driver, 5).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".store-list li:first-child")))
             first_store.click()
-            time.sleep(1)
             
             confirm_btn = WebDriverWait(driver, 5).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".confirm-store")))
             confirm_btn.click()
             print("✅ Selected first available store")
-            time.sleep(2)
+            wait_until_ready(driver, baseline=2, label="store modal")
             return True
         except Exception as e:
             print(f"❌ Failed to select store: {str(e)}")
@@ -119,7 +113,6 @@ def handle_age_verification(driver):
             
             # Scroll to button and click with JavaScript
             driver.execute_script("arguments[0].scrollIntoView();", yes_button)
-            time.sleep(1)
             driver.execute_script("arguments[0].click();", yes_button)
             print("✅ Clicked 'Yes' on age verification")
             
@@ -127,7 +120,7 @@ def handle_age_verification(driver):
             WebDriverWait(driver, 5).until(
                 EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal-content"))
             )
-            time.sleep(1)
+            wait_until_ready(driver, baseline=1, label="age verification")
             return True
         else:
             print("ℹ️ Found a modal but not age verification - proceeding")
@@ -193,114 +186,134 @@ def scrape_products_page(driver, category_name):
     products = []
     # Scroll to load lazy-loaded products
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(3)  # Wait for loading
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    
-    for product in soup.select(".products.productInfoJs"):
-        try:
-            name = product.select_one(".products-title").get_text(strip=True)
-            price_elem = (product.select_one(".products-price-new") or 
-                         product.select_one(".products-price-old"))
-            price = price_elem.get_text(strip=True) if price_elem else "Price not found"
-            
-            products.append({
-                "Category": category_name,
-                "Product Name": name,
-                "Price": price
-            })
-        except Exception as e:
-            print(f"⚠️ Error parsing product: {str(e)}")
-            continue
+    wait_until_ready(driver, PRODUCT_SELECTOR, baseline=3, label="lazy load")
     
+    if EXTRACT_IN_BROWSER:
+        products.extend(product_records(read_products(driver), category_name))
+        return products
+    with metrics.stage("transfer"):
+        html = driver.page_source
+    metrics.count(page_source_chars=len(html))
+    products.extend(extract_products(html, category_name))
     return products
 
 
-def scrape_category(driver, category_name, category_url):
-    """Scrape all pages of a category"""
-    print(f"\n🌐 Starting category: {category_name}")
-    
-    try:
-        # Navigate to category URL
-        driver.get(category_url)
-        time.sleep(PAGE_LOAD_DELAY)
-        
-        # Handle any modals
-        if not handle_age_verification(driver):
-            print("⚠️ Age verification may have failed - trying to continue anyway")
-        
-        all_products = []
-        page_count = 1
-        
-        while page_count <= MAX_PAGES:
-            print(f"   📖 Processing page {page_count}")
-            
-            # Scrape current page
-            page_products = scrape_products_page(driver, category_name)
-            all_products.extend(page_products)
-            print(f"   ✔ Found {len(page_products)} products")
-            
-            # Try to go to next page
-            try:
-                next_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "li.pagination-item.next > button"))
-                )
-                driver.execute_script("arguments[0].click();", next_button)
-                page_count += 1
-                time.sleep(PAGE_LOAD_DELAY)
-            except (TimeoutException, NoSuchElementException):
-                print("   ⏹ Reached last page")
-                break
-            except Exception as e:
-                print(f"   ❌ Pagination error: {str(e)}")
-                save_screenshot(driver, "pagination_error")
-                break
-                
-        return all_products
-    
+def product_records(products, category_name):
+    """Product records from (name, price) pairs"""
+    return [
+        {
+            "Category": category_name,
+            "Product Name": name,
+            "Price": price if price is not None else "Price not found"
+        }
+        for name, price in products
+    ]
 
-        
+
+def extract_products(html, category_name):
+    """Product records from a listing page's HTML"""
+    return product_records(parse_products(html), category_name)
+
+
+def go_to_next_page(driver, page):
+    """Click through to the next page; False on the last page"""
+    try:
+        with metrics.stage("wait"):
+            next_button = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "li.pagination-item.next > button"))
+            )
+        current_listing = products_signature(driver, PRODUCT_SELECTOR)
+        driver.execute_script("arguments[0].click();", next_button)
+        wait_until_ready(driver, PRODUCT_SELECTOR, current_listing, baseline=PAGE_LOAD_DELAY,
+                         label=f"page {page + 1}", verbose=True)
+        return True
+    except (TimeoutException, NoSuchElementException):
+        return False
     except Exception as e:
-        print(f"❌ Category scraping failed: {str(e)}")
-        save_screenshot(driver, f"category_fail_{category_name}")
-        return []
+        print(f"   ❌ Pagination error: {str(e)}")
+        save_screenshot(driver, "pagination_error")
+        return False
+
 
 # ======================
-# MAIN EXECUTION
+# SITE ADAPTER
 # ======================
-def main():
-    driver = setup_driver()
-    
-    try:
+class LiquorAdapter(SiteAdapter):
+    name = "Quickmart liquor"
+    listing_selector = PRODUCT_SELECTOR
+    max_pages = MAX_PAGES
+    output_file = OUTPUT_FILE
+    group_field = "Category"
+    source = "quickmart_liquor"
+    dtypes = dict.fromkeys(["Category", "Product Name", "Price"], "string")
+    price_history = {"id_column": "Product Name", "price_column": "Price", "name_column": "Product Name",
+                     "category_column": "Category"}
+    dedupe_fields = ("Product Name",)
+
+    def start_urls(self):
+        return MANUAL_CATEGORIES
+
+    def prepare(self, fetcher):
         # First visit homepage to set cookies/context
         print("🏠 Visiting homepage...")
-        driver.get("https://www.quickmart.co.ke")
-        time.sleep(3)
+        fetcher.get("https://www.quickmart.co.ke")
+        wait_until_ready(fetcher.driver, baseline=3, label="homepage")
         
         # Handle store selection
-        if not accept_store_modal(driver):
+        with metrics.stage("modal"):
+            accepted = accept_store_modal(fetcher.driver)
+        if not accepted:
             print("⚠️ Store selection failed - trying to continue anyway")
+        return True
+
+    def open_group(self, fetcher, group, url):
+        try:
+            fetcher.get(url)
+            wait_until_ready(fetcher.driver, baseline=PAGE_LOAD_DELAY, label=f"{group} load")
+        except Exception:
+            save_screenshot(fetcher.driver, f"category_fail_{group}")
+            raise
         
-        # Scrape all categories
-        all_products = []
-        for cat_name, cat_url in MANUAL_CATEGORIES:
-            products = scrape_category(driver, cat_name, cat_url)
-            all_products.extend(products)
-            print(f"✅ Finished '{cat_name}' with {len(products)} products")
-        
-        # Save results
-        if all_products:
-            df = pd.DataFrame(all_products)
-            df.to_excel(OUTPUT_FILE, index=False)
-            print(f"\n🎉 Success! Saved {len(all_products)} products to {OUTPUT_FILE}")
-        else:
-            print("😢 No products were scraped")
-            
-    except Exception as e:
-        print(f"💥 Critical error: {str(e)}")
-        save_screenshot(driver, "main_error")
-    finally:
-        driver.quit()
-        print("🌐 Browser closed")
+        # Handle any modals
+        with metrics.stage("modal"):
+            verified = handle_age_verification(fetcher.driver)
+        if not verified:
+            print("⚠️ Age verification may have failed - trying to continue anyway")
+
+    def next_page(self, fetcher, group, url, page):
+        return go_to_next_page(fetcher.driver, page)
+
+    def extract_records(self, html, group, page_url):
+        return extract_products(html, group)
+
+    def extract_page(self, fetcher, group, html=None):
+        # Products lazy-load on scroll, so the page is read after scrolling rather than reusing html
+        return scrape_products_page(fetcher.driver, group)
+
+    def page_html(self, fetcher):
+        return fetcher.listing_html(PRODUCT_SELECTOR) if EXTRACT_IN_BROWSER else fetcher.html()
+
+
+def scrape_category(driver, category_name, category_url):
+    """Scrape all pages of a category"""
+    return scrape_group(LiquorAdapter(), BrowserFetcher(driver), category_name, category_url)
+
+# ======================
+# MAIN EXECUTION
+# ======================
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Quickmart liquor categories")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-extract products from the page cache instead of the website")
+    args = parser.parse_args()
+
+    adapter = LiquorAdapter()
+    if args.replay:
+        save_replay(adapter)
+        return
+    sink, checkpoint = open_run(adapter)
+    run_adapter(adapter, sink=sink, checkpoint=checkpoint)
+    finalize_records(adapter, sink, checkpoint=checkpoint)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
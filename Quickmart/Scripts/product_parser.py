@@ -0,0 +1,166 @@
+from bs4 import BeautifulSoup
+
+from Common.metrics import metrics
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# ======================
+# CONFIGURATION
+# ======================
+PARSER_BACKEND = "auto"  # "selectolax", "lxml", "bs4", or "auto" for the fastest one installed
+PRODUCT_SELECTOR = ".products.productInfoJs"
+TITLE_SELECTOR = ".products-title"
+PRICE_SELECTORS = (".products-price-new", ".products-price-old")
+
+# (name, price) of every card, read in the browser in one call. Text is
+# joined from trimmed text nodes, like get_text(strip=True) in the backends below.
+PRODUCTS_JS = """
+const text = element => {
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    let joined = '';
+    while (walker.nextNode()) joined += walker.currentNode.nodeValue.trim();
+    return joined;
+};
+const products = [];
+for (const card of document.querySelectorAll(arguments[0])) {
+    const title = card.querySelector(arguments[1]);
+    if (!title) continue;
+    let price = null;
+    for (const selector of arguments[2]) {
+        const found = card.querySelector(selector);
+        if (found) { price = text(found); break; }
+    }
+    products.push([text(title), price]);
+}
+return products;
+"""
+
+
+# ======================
+# BACKENDS
+# ======================
+# Every backend takes page HTML and returns (name, price) pairs, with price
+# None when the card has neither a new nor an old price.
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlParser:
+    name = "lxml"
+
+    def __init__(self):
+        # XPath equivalents of the CSS selectors, compiled once
+        self.cards = etree.XPath(f"//*[{_has_class('products')} and {_has_class('productInfoJs')}]")
+        self.title = etree.XPath(f".//*[{_has_class('products-title')}]")
+        self.prices = [etree.XPath(f".//*[{_has_class(selector[1:])}]") for selector in PRICE_SELECTORS]
+
+    @staticmethod
+    def _text(element):
+        # Matches BeautifulSoup's get_text(strip=True)
+        return "".join(part.strip() for part in element.itertext())
+
+    def parse(self, html):
+        if not html:
+            return []
+        with metrics.stage("parse"):
+            tree = lxml_html.fromstring(html)
+        products = []
+        for card in self.cards(tree):
+            titles = self.title(card)
+            if not titles:
+                continue
+            price = None
+            for price_xpath in self.prices:
+                found = price_xpath(card)
+                if found:
+                    price = self._text(found[0])
+                    break
+            products.append((self._text(titles[0]), price))
+        return products
+
+
+class SelectolaxParser:
+    name = "selectolax"
+
+    @staticmethod
+    def _text(node):
+        return "".join(part.strip() for part in node.text(deep=True, separator="\0").split("\0"))
+
+    def parse(self, html):
+        with metrics.stage("parse"):
+            tree = LexborHTMLParser(html)
+        products = []
+        for card in tree.css(PRODUCT_SELECTOR):
+            title = card.css_first(TITLE_SELECTOR)
+            if title is None:
+                continue
+            price = None
+            for selector in PRICE_SELECTORS:
+                found = card.css_first(selector)
+                if found is not None:
+                    price = self._text(found)
+                    break
+            products.append((self._text(title), price))
+        return products
+
+
+class SoupParser:
+    name = "bs4"
+
+    def parse(self, html):
+        with metrics.stage("parse"):
+            soup = BeautifulSoup(html, "html.parser")
+        products = []
+        for card in soup.select(PRODUCT_SELECTOR):
+            title = card.select_one(TITLE_SELECTOR)
+            if title is None:
+                continue
+            price_elem = card.select_one(PRICE_SELECTORS[0]) or card.select_one(PRICE_SELECTORS[1])
+            products.append((title.get_text(strip=True), price_elem.get_text(strip=True) if price_elem else None))
+        return products
+
+
+# Fastest first
+BACKENDS = {
+    "selectolax": (SelectolaxParser, LexborHTMLParser is not None),
+    "lxml": (LxmlParser, lxml_html is not None),
+    "bs4": (SoupParser, True),
+}
+
+_parsers = {}
+
+
+def get_parser(backend=PARSER_BACKEND):
+    """Return a cached parser for the backend, falling back to BeautifulSoup"""
+    if backend == "auto":
+        backend = available_backends()[0]
+    if backend not in _parsers:
+        backend_class, available = BACKENDS[backend]
+        if not available:
+            print(f"⚠️ Parser backend '{backend}' is not installed - using bs4")
+            backend_class = SoupParser
+        _parsers[backend] = backend_class()
+    return _parsers[backend]
+
+
+def available_backends():
+    return [name for name, (_, available) in BACKENDS.items() if available]
+
+
+def parse_products(html, backend=PARSER_BACKEND):
+    """(name, price) for every product card on a Quickmart listing page"""
+    return get_parser(backend).parse(html)
+
+
+def read_products(driver):
+    """parse_products for the page open in the browser, without transferring its page_source"""
+    products = driver.execute_script(PRODUCTS_JS, PRODUCT_SELECTOR, TITLE_SELECTOR, list(PRICE_SELECTORS))
+    return [(name, price) for name, price in products or []]
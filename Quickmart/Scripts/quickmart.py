@@ -1,21 +1,27 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
+from selenium.common.exceptions import TimeoutException
+import os
+import sys
+import argparse
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.engine import (MAX_SESSIONS_PER_HOST, BrowserFetcher, SiteAdapter, finalize_records, open_run, paginate,
+                           run_adapter, save_records, save_replay, scrape_group)
+from Common.changes import ChangeTracker
+from Common.metrics import metrics
+from Common.sinks import SINK_FORMAT, SINKS
+from Common.readiness import products_signature, wait_until_ready
+from product_parser import PRODUCT_SELECTOR, parse_products, read_products
+
 
 # ======================
 # CONFIGURATION
 # ======================
 MANUAL_CATEGORIES = [
-    ("Landing_Page", "https://www.quickmart.co.ke"),
-
     ("Foods", "https://www.quickmart.co.ke/foods"),
     ("Fresh Produce", "https://www.quickmart.co.ke/fresh"),
     ("Personal Care", "https://www.quickmart.co.ke/personal-care"),
@@ -23,79 +29,17 @@ MANUAL_CATEGORIES = [
     ("Household Items", "https://www.quickmart.co.ke/households"), 
     ("Home Care", "https://www.quickmart.co.ke/homecare"),
     ("Electronics", "https://www.quickmart.co.ke/electronics"),
-    ("Textile","https://www.quickmart.co.ke/textile")
-    
+    ("Textile","https://www.quickmart.co.ke/textile"),
+
+    # Its products mostly repeat the real categories; see QuickmartAdapter.last_groups
+    ("Landing_Page", "https://www.quickmart.co.ke"),
 ]
 today_str = datetime.today().strftime("%d-%m-%Y")
 OUTPUT_FILE = f"Quickmart/Quickmart Data/Raw Data/Quickmart_raw_{today_str}.xlsx"  # Single output file for all categories
-PAGE_LOAD_DELAY = 3  # Seconds to wait between page loads
 MAX_PAGES = 150  # Safety limit to prevent infinite loops
+WORKERS = 1  # Parallel browser sessions pulling categories from a shared queue (1 = sequential)
+EXTRACT_IN_BROWSER = True  # Read product cards with one execute_script per page instead of parsing page_source
 
-# ======================
-# SETUP SELENIUM DRIVER
-# ======================
-
-def accept_store_modal(driver, location="Nairobi"):
-    """Handle the location modal with improved reliability"""
-    try:
-        # Wait for modal and input field
-        modal = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "modal-content"))
-        )
-        
-        if not modal.is_displayed():
-            return True
-            
-        input_box = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable((By.ID, "location_fld_popup"))
-        )
-        
-        # Clear and enter location
-        input_box.clear()
-        input_box.send_keys(location)
-        time.sleep(2)  # Wait for suggestions
-        
-        # Try clicking first suggestion
-        try:
-            suggestions = WebDriverWait(driver, 5).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".pac-item"))
-            )
-            if suggestions:
-                suggestions[0].click()
-                print(f"✅ Selected location: {location}")
-                time.sleep(2)
-                return True
-        except:
-            # If no suggestions, try Enter key
-            input_box.send_keys(Keys.ENTER)
-            time.sleep(2)
-            print(f"✅ Entered location: {location}")
-            return True
-            
-    except Exception as e:
-        print(f"❌ Modal handling error: {str(e)}")
-        return False
-    
-def setup_driver():
-    """Setup Chrome driver with enhanced options"""
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
-    driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
-    return driver
-
-import random
-import time
-
-def polite_delay(min_delay=2, max_delay=6):
-    delay = random.uniform(min_delay, max_delay)
-    time.sleep(delay)
 # ======================
 # SCRAPING FUNCTIONS
 # ======================
@@ -112,7 +56,6 @@ def accept_store_modal(driver, location="Nairobi"):
         )
         input_box.clear()
         input_box.send_keys(location)
-        time.sleep(2)
         try:
             suggestions = WebDriverWait(driver, 5).until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".pac-item"))
@@ -120,11 +63,11 @@ def accept_store_modal(driver, location="Nairobi"):
             if suggestions:
                 suggestions[0].click()
                 print(f"✅ Selected location: {location}")
-                time.sleep(2)
+                wait_until_ready(driver, baseline=2, label="store selection")
                 return True
         except:
             input_box.send_keys(Keys.ENTER)
-            time.sleep(2)
+            wait_until_ready(driver, baseline=2, label="store selection")
             print(f"✅ Entered location: {location}")
             return True
     except Exception as e:
@@ -133,160 +76,183 @@ def accept_store_modal(driver, location="Nairobi"):
     
 
 
-def handle_pagination(driver, category_name):
-    """Handles pagination using the site's JavaScript pagination function"""
-    all_products = []
-    page = 1
-    
-    while page <= MAX_PAGES:
-        print(f"   📄 Processing page {page}...")
-        
-        try:
-            # Wait for products to load
+def go_to_next_page(driver, page):
+    """Move to the next page with the site's JavaScript pagination function"""
+    try:
+        # Check if next page exists
+        with metrics.stage("wait"):
             WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".products.productInfoJs"))
-            )
-            
-            # Get products from current page
-            current_products = scrape_products_page(driver, category_name)
-            all_products.extend(current_products)
-            print(f"   ✔ Found {len(current_products)} products on this page")
-            
-            # Check if next page exists
-            next_button = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((
                     By.CSS_SELECTOR, 
                     "li.pagination-item.next button.pagination-link"
                 ))
             )
-            
-            # Store current URL
-            current_url = driver.current_url
-            
-            # Execute the JavaScript pagination function directly
-            next_page = page + 1
-            driver.execute_script(f"goToProductListingSearchPage({next_page});")
-            
-            # Wait for page change
-            try:
-                WebDriverWait(driver, 10).until(
-                    lambda d: d.current_url != current_url
-                )
-                time.sleep(2)  # Wait for content to load
-                page += 1
-            except TimeoutException:
-                print("   ⏹ Last page reached")
-                break
-                
-        except TimeoutException:
-            print("   ⏹ No more pages available")
-            break
-        except Exception as e:
-            print(f"   ❌ Error during pagination: {str(e)}")
-            break
+    except TimeoutException:
+        return False
     
-    return all_products
-
-def scrape_products_page(driver, category_name):
-    """Extracts products from current page"""
-    products = []
+    # Store current URL and listing so the next page can be told apart
+    current_url = driver.current_url
+    current_listing = products_signature(driver, PRODUCT_SELECTOR)
+    
+    # Execute the JavaScript pagination function directly
+    next_page = page + 1
+    driver.execute_script(f"goToProductListingSearchPage({next_page});")
     
+    # Wait for page change
     try:
-        # Get page source after all products are loaded
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        # Find all product elements
-        product_elements = soup.select(".products.productInfoJs")
-        
-        for product in product_elements:
-            try:
-                name = product.select_one(".products-title").get_text(strip=True)
-                price_elem = (product.select_one(".products-price-new") or 
-                            product.select_one(".products-price-old"))
-                price = price_elem.get_text(strip=True) if price_elem else "N/A"
-                
-                products.append({
-                    "category": category_name,
-                    "name": name,
-                    "price": price,
-                    "url": driver.current_url  # Add page URL for debugging
-                })
-            except Exception as e:
-                print(f"   ⚠ Error extracting product: {str(e)}")
-                continue
-                
-    except Exception as e:
-        print(f"   ❌ Error scraping page: {str(e)}")
+        with metrics.stage("wait"):
+            WebDriverWait(driver, 10).until(
+                lambda d: d.current_url != current_url
+            )
+    except TimeoutException:
+        return False
+    wait_until_ready(driver, PRODUCT_SELECTOR, current_listing, baseline=2,
+                     label=f"page {next_page}", verbose=True)
+    return True
+
+def product_records(products, category_name, page_url):
+    """Product records from (name, price) pairs"""
+    return [
+        {
+            "category": category_name,
+            "name": name,
+            "price": price if price is not None else "N/A",
+            "url": page_url  # Add page URL for debugging
+        }
+        for name, price in products
+    ]
+
+def extract_products(html, category_name, page_url):
+    """Extracts product records from a listing page's HTML"""
+    return product_records(parse_products(html), category_name, page_url)
+
+def open_category(driver, category_name, category_url):
+    """Load a category, re-selecting the store if the modal comes back"""
+    driver.get(category_url)
+    wait_until_ready(driver, baseline=3, label=f"{category_name} load")
+    
+    # Handle modal if present
+    with metrics.stage("modal"):
+        accepted = accept_store_modal(driver)
+    if accepted:
+        # Wait for page to load after modal
+        wait_until_ready(driver, baseline=3, label=f"{category_name} modal")
+        driver.refresh()
+        wait_until_ready(driver, PRODUCT_SELECTOR, baseline=3, label=f"{category_name} refresh")
     
-    return products
+    # Ensure products are loaded
+    with metrics.stage("wait"):
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, PRODUCT_SELECTOR))
+        )
+
+# ======================
+# SITE ADAPTER
+# ======================
+class QuickmartAdapter(SiteAdapter):
+    name = "Quickmart"
+    listing_selector = PRODUCT_SELECTOR
+    max_pages = MAX_PAGES
+    output_file = OUTPUT_FILE
+    run_id = "quickmart"  # OUTPUT_FILE carries the date; a run resumed the next day keeps its checkpoint
+    group_field = "category"
+    source = "quickmart"
+    dtypes = dict.fromkeys(["category", "name", "price", "url"], "string")
+    # Cards carry no product ID, so products are keyed on their normalized name
+    price_history = {"id_column": "name", "price_column": "price", "name_column": "name",
+                     "category_column": "category"}
+    dedupe_fields = ("name",)  # Names include the pack size
+    last_groups = ("Landing_Page",)  # Started after the real categories finish, so its copies are the ones dropped
+
+    def __init__(self, categories=MANUAL_CATEGORIES):
+        self.categories = categories
+
+    def start_urls(self):
+        return self.categories
+
+    def prepare(self, fetcher):
+        fetcher.get("https://www.quickmart.co.ke")
+        with metrics.stage("modal"):
+            return accept_store_modal(fetcher.driver)
+
+    def open_group(self, fetcher, group, url):
+        open_category(fetcher.driver, group, url)
+
+    def next_page(self, fetcher, group, url, page):
+        return go_to_next_page(fetcher.driver, page)
+
+    def resume_page(self, fetcher, group, url, page):
+        # The site's pagination function jumps straight to any page
+        return go_to_next_page(fetcher.driver, page - 1)
+
+    def extract_records(self, html, group, page_url):
+        return extract_products(html, group, page_url)
+
+    def extract_page(self, fetcher, group, html=None):
+        if not EXTRACT_IN_BROWSER:
+            return super().extract_page(fetcher, group, html)
+        return product_records(read_products(fetcher.driver), group, fetcher.current_url)
+
+    def page_html(self, fetcher):
+        return fetcher.listing_html(PRODUCT_SELECTOR) if EXTRACT_IN_BROWSER else fetcher.html()
+
+def handle_pagination(driver, category_name, changes=None):
+    """Handles pagination using the site's JavaScript pagination function.
+
+    With a ChangeTracker, pages unchanged since the last run are skipped.
+    """
+    return paginate(QuickmartAdapter(), BrowserFetcher(driver), category_name, driver.current_url,
+                    changes=changes)
 
 def scrape_category(driver, category_name, category_url):
     """Scrape category with improved modal and pagination handling"""
-    print(f"\n🔍 Scraping category: {category_name}")
-    
-    try:
-        driver.get(category_url)
+    return scrape_group(QuickmartAdapter(), BrowserFetcher(driver), category_name, category_url)
 
-        time.sleep(3)
-        
-        # Handle modal if present
-        if accept_store_modal(driver):
-            # Wait for page to load after modal
-            time.sleep(3)
-            driver.refresh()
-            time.sleep(3)
-        
-        # Ensure products are loaded
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".products.productInfoJs"))
-        )
-        
-        return handle_pagination(driver, category_name)
-        
+def start_session():
+    """Open a browser session on the landing page with the store selected"""
+    fetcher = BrowserFetcher()
+    try:
+        if QuickmartAdapter().prepare(fetcher):
+            return fetcher.driver
     except Exception as e:
-        print(f"❌ Error in category {category_name}: {str(e)}")
-        return []
+        print(f"❌ Critical error: {str(e)}")
+    fetcher.close()
+    return None
+
+def save_products(all_products):
+    save_records(QuickmartAdapter(), all_products)
 
 # ======================
 # MAIN EXECUTION
 # ======================
 def main():
-    driver = setup_driver()
-    driver.execute_cdp_cmd(
-        "Page.addScriptToEvaluateOnNewDocument",
-        {
-            "source": """
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined})
-            """
-        }
-    )
-    
-    try:
-        # Open site and accept store modal
-        driver.get("https://www.quickmart.co.ke")
-        if not accept_store_modal(driver):
-            return
-        
-        # Scrape all categories
-        all_products = []
-        for cat_name, category_url in MANUAL_CATEGORIES:
-            category_products = scrape_category(driver, cat_name, category_url)
-            all_products.extend(category_products)
-            print(f"✅ Finished '{cat_name}' with {len(category_products)} products")
-        
-        # Save results
-        if all_products:
-            df = pd.DataFrame(all_products)
-            df.to_excel(OUTPUT_FILE, index=False)
-            print(f"\n🎉 Success! Saved {len(all_products)} products to '{OUTPUT_FILE}'")
-        else:
-            print("⚠️ No products were scraped")
-            
-    except Exception as e:
-        print(f"❌ Critical error: {str(e)}")
-    finally:
-        driver.quit()
-        print("Browser closed")
+    parser = argparse.ArgumentParser(description="Scrape Quickmart product categories")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="number of parallel browser sessions")
+    parser.add_argument("--max-per-host", type=int, default=MAX_SESSIONS_PER_HOST,
+                        help="maximum sessions scraping the same host at once")
+    parser.add_argument("--format", choices=sorted(SINKS), default=SINK_FORMAT,
+                        help="format products are staged in before the run is stored in the Parquet store")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="skip pages unchanged since the last run and store only new/removed/repriced products")
+    parser.add_argument("--replay", action="store_true",
+                        help="re-extract products from the page cache instead of the website (no network)")
+    args = parser.parse_args()
+
+    adapter = QuickmartAdapter()
+    if args.replay:
+        save_replay(adapter)
+        return
+    if args.workers > 1:
+        print(f"🚀 Scraping {len(MANUAL_CATEGORIES)} categories with {args.workers} workers")
+
+    # Products are appended to disk page by page and stored once the run finishes.
+    # A run that stopped part-way is resumed from its checkpoint.
+    sink, checkpoint = open_run(adapter, args.format, changes_only=args.changes_only)
+    changes = ChangeTracker.for_adapter(adapter, resume=checkpoint.resuming) if args.changes_only else None
+    run_adapter(adapter, workers=args.workers, max_per_host=args.max_per_host, sink=sink, checkpoint=checkpoint,
+                changes=changes)
+    finalize_records(adapter, sink, checkpoint=checkpoint, changes=changes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,238 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+import argparse
+
+from quickmart import (
+    MANUAL_CATEGORIES,
+    PRODUCT_SELECTOR,
+    QuickmartAdapter,
+    open_category,
+    start_session,
+)
+from Common.engine import (BrowserFetcher, HttpFetcher, SiteAdapter, finalize_records, open_run, run_adapter,
+                           succeeded)
+from Common.sinks import SINK_FORMAT, SINKS
+
+# ======================
+# CONFIGURATION
+# ======================
+HTTP_POOL_SIZE = 8  # Keep-alive connections kept open to the host
+HTTP_WORKERS = 4  # Categories fetched concurrently, one pooled session each
+
+# ======================
+# BROWSER BOOTSTRAP
+# ======================
+def browser_identity(driver):
+    """User agent and cookies (with the selected store) of the browser session"""
+    return driver.execute_script("return navigator.userAgent"), driver.get_cookies()
+
+def export_session(user_agent, cookies):
+    """A pooled requests session presenting the browser's cookies and user agent"""
+    session = requests.Session()
+    # 429/503 are retried by the engine, after the rate limiter's pause
+    retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 504], respect_retry_after_header=False)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    return session
+
+def page_url_template(page_two_url):
+    """Turn the URL the site lands on for page 2 into a '{page}' template"""
+    parsed = urlparse(page_two_url)
+
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    for i, (key, value) in enumerate(query):
+        if value == "2":
+            query[i] = (key, "__PAGE__")
+            return urlunparse(parsed._replace(query=urlencode(query))).replace("__PAGE__", "{page}")
+
+    segments = parsed.path.split("/")
+    for i in range(len(segments) - 1, -1, -1):
+        if segments[i] == "2":
+            segments[i] = "{page}"
+            return urlunparse(parsed._replace(path="/".join(segments)))
+
+    return None
+
+def discover_page_template(driver, category_name, category_url):
+    """Let the site's own goToProductListingSearchPage reveal its paginated URL"""
+    open_category(driver, category_name, category_url)
+
+    current_url = driver.current_url
+    driver.execute_script("goToProductListingSearchPage(2);")
+    try:
+        WebDriverWait(driver, 10).until(lambda d: d.current_url != current_url)
+    except TimeoutException:
+        return None
+
+    return page_url_template(driver.current_url)
+
+class SwitchingFetcher:
+    """A worker's HTTP session, plus a browser opened the first time a group needs one.
+
+    open_group picks the fetcher for each group; every other call goes to
+    the one in use.
+    """
+
+    def __init__(self, session, open_browser):
+        self.http = HttpFetcher(session=session)
+        self.browser = None
+        self.open_browser = open_browser
+        self.active = self.http
+
+    def use(self, in_browser):
+        if in_browser and self.browser is None:
+            self.browser = self.open_browser()
+        self.active = self.browser if in_browser else self.http
+
+    @property
+    def in_browser(self):
+        return self.active is self.browser
+
+    def __getattr__(self, name):
+        return getattr(self.active, name)
+
+    def close(self):
+        self.http.close()
+        if self.browser is not None:
+            self.browser.close()
+
+# ======================
+# SITE ADAPTER
+# ======================
+class QuickmartHttpAdapter(QuickmartAdapter):
+    """Quickmart's listing pages fetched over HTTP, with the browser's store cookies.
+
+    Categories without a paginated URL template are scraped in a browser
+    instead, by the same workers. Records, output, checkpoint and page cache
+    are the same as the browser adapter's, so either script can resume a
+    run the other started.
+    """
+
+    def __init__(self, templates, identity, categories=MANUAL_CATEGORIES):
+        super().__init__(categories)
+        self.templates = templates
+        self.identity = identity
+        self.listings = {}  # Card texts of each group's current page
+
+    def create_fetcher(self):
+        return SwitchingFetcher(export_session(*self.identity), self.open_browser)
+
+    def open_browser(self):
+        fetcher = BrowserFetcher()
+        if not super().prepare(fetcher):
+            fetcher.close()
+            raise RuntimeError("could not select the store in the browser")
+        return fetcher
+
+    def prepare(self, fetcher):
+        # The store was selected in the browser; its cookies come with the session
+        return True
+
+    def open_group(self, fetcher, group, url):
+        # Categories discovery found no page URL for are scraped in the browser
+        fetcher.use(url not in self.templates)
+        if fetcher.in_browser:
+            super().open_group(fetcher, group, url)
+        else:
+            fetcher.get(url)
+
+    def page_url(self, url, page):
+        template = self.templates.get(url)
+        if page == 1 or template is None:
+            return SiteAdapter.page_url(self, url, page)
+        return template.format(page=page)
+
+    def next_page(self, fetcher, group, url, page):
+        if fetcher.in_browser:
+            return super().next_page(fetcher, group, url, page)
+        next_url = self.page_url(url, page + 1)
+        if next_url is None:
+            return False
+        current = self.listings.pop(group, None) or fetcher.listing_texts(PRODUCT_SELECTOR)
+        fetcher.get(next_url)
+        status, _ = fetcher.last_response()
+        if not succeeded(status):
+            # paginate stops on the error page without checkpointing it
+            return True
+        # Past the last page the site either renders nothing or repeats the last page
+        self.listings[group] = fetcher.listing_texts(PRODUCT_SELECTOR)
+        return bool(self.listings[group]) and self.listings[group] != current
+
+    def resume_page(self, fetcher, group, url, page):
+        if fetcher.in_browser:
+            return super().resume_page(fetcher, group, url, page)
+        return SiteAdapter.resume_page(self, fetcher, group, url, page)
+
+    def extract_page(self, fetcher, group, html=None):
+        if fetcher.in_browser:
+            return super().extract_page(fetcher, group, html)
+        return SiteAdapter.extract_page(self, fetcher, group, html)
+
+    def page_html(self, fetcher):
+        return super().page_html(fetcher) if fetcher.in_browser else fetcher.html()
+
+# ======================
+# MAIN EXECUTION
+# ======================
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Quickmart listing pages over HTTP")
+    parser.add_argument("--workers", type=int, default=HTTP_WORKERS,
+                        help="number of categories fetched concurrently")
+    parser.add_argument("--max-per-host", type=int, default=HTTP_WORKERS,
+                        help="maximum sessions fetching from the same host at once")
+    parser.add_argument("--format", choices=sorted(SINKS), default=SINK_FORMAT,
+                        help="format products are staged in before the run is stored in the Parquet store")
+    args = parser.parse_args()
+
+    adapter = QuickmartAdapter()
+    sink, checkpoint = open_run(adapter, args.format)  # Shared with quickmart.py, which can resume it too
+
+    driver = start_session()
+    if driver is None:
+        return
+
+    templates = {}
+    try:
+        # Use the browser only to learn each category's paginated URL
+        for cat_name, category_url in MANUAL_CATEGORIES:
+            if checkpoint.start_page(cat_name) is None:
+                continue
+            try:
+                template = discover_page_template(driver, cat_name, category_url)
+            except Exception as e:
+                print(f"❌ Error discovering pages for {cat_name}: {str(e)}")
+                template = None
+
+            if template:
+                templates[category_url] = template
+                print(f"🔗 {cat_name}: {template}")
+            else:
+                # Single-page categories or unknown URL schemes stay in the browser
+                print(f"⚠️ No paginated URL for {cat_name} - scraping it in the browser")
+        identity = browser_identity(driver)
+    finally:
+        driver.quit()
+        print("Browser closed")
+
+    # One run for both kinds of category, so Landing_Page still waits for every other one
+    run_adapter(QuickmartHttpAdapter(templates, identity), workers=args.workers, max_per_host=args.max_per_host,
+                sink=sink, checkpoint=checkpoint)
+
+    finalize_records(adapter, sink, checkpoint=checkpoint)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from Common.driver import format_bytes, page_transfer_bytes, setup_driver
+from Common.readiness import products_signature, readiness_report, wait_until_ready
+from product_parser import PRODUCT_SELECTOR, parse_products
 
 # ======================
 # CONFIGURATION
@@ -48,7 +53,6 @@ def accept_store_modal(driver, location="Nairobi"):
         # Clear and enter location
         input_box.clear()
         input_box.send_keys(location)
-        time.sleep(2)  # Wait for suggestions
         
         # Try clicking first suggestion
         try:
@@ -58,12 +62,12 @@ def accept_store_modal(driver, location="Nairobi"):
             if suggestions:
                 suggestions[0].click()
                 print(f"✅ Selected location: {location}")
-                time.sleep(2)
+                wait_until_ready(driver, baseline=2, label="store selection")
                 return True
         except:
             # If no suggestions, try Enter key
             input_box.send_keys(Keys.ENTER)
-            time.sleep(2)
+            wait_until_ready(driver, baseline=2, label="store selection")
             print(f"✅ Entered location: {location}")
             return True
             
@@ -71,19 +75,6 @@ def accept_store_modal(driver, location="Nairobi"):
         print(f"❌ Modal handling error: {str(e)}")
         return False
 
-def setup_driver():
-    """Setup Chrome driver with enhanced options"""
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    
-    driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
-    return driver
-
 # def scrape_products_page(driver, category_name):
 #     """Extracts products from current page"""
 #     products = []
@@ -120,6 +111,17 @@ def setup_driver():
     
 #     return products
 
+def scrape_products_page(driver, category_name):
+    """Extracts products from current page"""
+    return [
+        {
+            "category": category_name,
+            "name": name,
+            "price": price if price is not None else "N/A"
+        }
+        for name, price in parse_products(driver.page_source)
+    ]
+
 def handle_pagination(driver, category_name):
     """Handles pagination using the site's specific pagination structure"""
     all_products = []
@@ -137,7 +139,8 @@ def handle_pagination(driver, category_name):
             # Get products from current page
             current_products = scrape_products_page(driver, category_name)
             all_products.extend(current_products)
-            print(f"   ✔ Found {len(current_products)} products on this page")
+            print(f"   ✔ Found {len(current_products)} products on this page "
+                  f"({format_bytes(page_transfer_bytes(driver))} transferred)")
             
             # Find next button with specific structure
             next_button = WebDriverWait(driver, 10).until(
@@ -147,8 +150,9 @@ def handle_pagination(driver, category_name):
                 ))
             )
             
-            # Store current URL for verification
+            # Store current URL and listing for verification
             current_url = driver.current_url
+            current_listing = products_signature(driver, PRODUCT_SELECTOR)
             
             # Execute the JavaScript click function directly
             page_number = page + 1
@@ -156,7 +160,8 @@ def handle_pagination(driver, category_name):
             
             # Wait for URL or content change
             WebDriverWait(driver, 10).until(lambda d: d.current_url != current_url)
-            time.sleep(2)  # Additional wait for content to load
+            wait_until_ready(driver, PRODUCT_SELECTOR, current_listing, baseline=2,
+                             label=f"page {page_number}", verbose=True)
             
             page += 1
             
@@ -225,14 +230,14 @@ def scrape_category(driver, category_name, category_url):
     
     try:
         driver.get(category_url)
-        time.sleep(3)
+        wait_until_ready(driver, baseline=3, label=f"{category_name} load")
         
         # Handle modal if present
         if accept_store_modal(driver):
             # Wait for page to load after modal
-            time.sleep(3)
+            wait_until_ready(driver, baseline=3, label=f"{category_name} modal")
             driver.refresh()
-            time.sleep(3)
+            wait_until_ready(driver, PRODUCT_SELECTOR, baseline=3, label=f"{category_name} refresh")
         
         # Ensure products are loaded
         WebDriverWait(driver, 10).until(
@@ -254,7 +259,7 @@ def main():
         # Initial setup
         driver.get(MANUAL_CATEGORIES[0][1])
         if accept_store_modal(driver):
-            time.sleep(3)
+            wait_until_ready(driver, baseline=3, label="store modal")
         
         # Process each category
         for category_name, category_url in MANUAL_CATEGORIES:
@@ -267,6 +272,7 @@ def main():
         print(f"❌ Main execution error: {str(e)}")
     finally:
         driver.quit()
+        readiness_report.summary()
         
     # Save results
     if all_products:
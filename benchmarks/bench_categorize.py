@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "Quickmart", "Scripts"))
+from categorize import CATEGORY_RULES, CategoryClassifier, extract_product_details, split_product_details
+
+BRANDS = ["Brookside", "Kensalt", "Pembe", "Menengai", "Dettol", "Ketepa", "Exe", "Tuzo", "Daawat", "Fresh Fri"]
+ITEMS = ["Milk", "Salt", "Maize Flour", "Bar Soap", "Antiseptic", "Tea Leaves", "Wheat Flour", "Yoghurt",
+         "Basmati Rice", "Cooking Oil", "Tissue Rolls", "Mineral Water"]
+SIZES = ["500ml", "1L", "1.5 L", "2kg", "250g", "90 grams", "6 pcs", "12 pieces", "1 pack", "3 kilos"]
+SUFFIXES = ["", " Bottle", " Refill", " - Promo Pack", " (Value)"]
+
+
+def synthetic_names(count, seed=0):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        name = f"{rng.choice(BRANDS)} {rng.choice(ITEMS)}"
+        if rng.random() < 0.9:  # Some products carry no size
+            name += f" {rng.choice(SIZES)}"
+        names.append(name + rng.choice(SUFFIXES))
+    return pd.Series(names)
+
+
+def categorize_loop(names, rules=CATEGORY_RULES):
+    """The previous approach: one lowercase + contains pass per category, last match wins"""
+    categories = pd.Series("Other", index=names.index)
+    for category, keywords, _ in rules:
+        mask = names.str.lower().str.contains("|".join(keywords), regex=True, na=False)
+        categories[mask] = category
+    return categories
+
+
+def padded_rules(count, seed=0):
+    """CATEGORY_RULES plus made-up categories, to see how runtime grows with the category count"""
+    rng = random.Random(seed)
+    rules = list(CATEGORY_RULES)
+    while len(rules) < count:
+        keywords = tuple("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6)) for _ in range(6))
+        rules.append((f"Extra {len(rules)}", keywords, len(rules) + 1))
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantity/unit extraction timings on synthetic product names")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.rows)
+
+    start = time.perf_counter()
+    row_wise = names.apply(split_product_details)
+    row_wise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = extract_product_details(names)
+    vectorized_time = time.perf_counter() - start
+
+    columns = ["product_name", "quantity", "unit", "description"]
+    same = (vectorized[columns].fillna("").values == row_wise[columns].fillna("").values).all()
+
+    print(f"{args.rows:,} product names")
+    print(f"   apply(split_product_details): {row_wise_time:7.2f} s")
+    print(f"   extract_product_details:      {vectorized_time:7.2f} s  "
+          f"{row_wise_time / vectorized_time:5.1f}x  ({'identical' if same else 'DIFFERENT'} output)")
+
+    for count in (len(CATEGORY_RULES), 32, 128):
+        rules = padded_rules(count)
+
+        start = time.perf_counter()
+        categorize_loop(names, rules)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        CategoryClassifier(rules).classify(names)
+        classify_time = time.perf_counter() - start
+
+        print(f"   {count:>3} categories - contains loop: {loop_time:6.2f} s  "
+              f"single scan: {classify_time:6.2f} s  {loop_time / classify_time:5.1f}x")
+
+if __name__ == "__main__":
+    main()
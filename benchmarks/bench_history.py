@@ -0,0 +1,76 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+from Common.history import PriceHistory, stable_ids
+
+CPI_ITEMS = ["maize flour", "wheat flour", "sugar", "milk", "cooking oil", "rice", "bread", "tea leaves"]
+WORDS = ["Jogoo", "Pembe", "Ajab", "Kabras", "Fresha", "Elianto", "Daawat", "Supaloaf", "Ketepa", "Mumias"]
+
+
+def synthetic_run(products, rng, change_rate):
+    """One day's scrape: every product, a few with a new price"""
+    for product in products:
+        if rng.random() < change_rate:
+            product["price"] = round(product["price"] * rng.uniform(0.9, 1.15), 2)
+    return pd.DataFrame({
+        "name": [product["name"] for product in products],
+        "price": [f"KSh {product['price']:,.2f}" for product in products],
+        "category": [product["category"] for product in products],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price history: daily upserts and year-over-year lookups")
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--change-rate", type=float, default=0.03, help="share of products repriced per day")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    products = [{"name": f"{rng.choice(WORDS)} {rng.choice(CPI_ITEMS).title()} {i}", "category": "Foods",
+                 "price": rng.randint(50, 900)} for i in range(args.products)]
+    days = pd.date_range(end="2025-06-30", periods=args.days).strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx_dir = os.path.join(tmp, "xlsx")
+        os.makedirs(xlsx_dir)
+        with PriceHistory(os.path.join(tmp, "history.sqlite")) as history:
+            start = time.perf_counter()
+            for day in days:
+                run = synthetic_run(products, rng, args.change_rate)
+                history.upsert(run, "quickmart", day, id_column="name", name_column="name",
+                               category_column="category")
+            upsert_time = (time.perf_counter() - start) / len(days)
+            # One dated xlsx per run, as before, for the last 30 days only (writing a year of them is slow)
+            for day in days[-30:]:
+                run.to_excel(os.path.join(xlsx_dir, f"Quickmart_{day}.xlsx"), index=False)
+
+            cpi = [next(item for item in CPI_ITEMS if item.title() in product["name"]) for product in products]
+            history.set_cpi_items(stable_ids("quickmart", run["name"]), cpi)
+            rows = history.conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+            start = time.perf_counter()
+            yoy = history.year_over_year("maize flour", days[-1])
+            query_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frames = [pd.read_excel(os.path.join(xlsx_dir, name)) for name in sorted(os.listdir(xlsx_dir))]
+        xlsx_time = (time.perf_counter() - start) / len(frames) * len(days)
+
+    print(f"{args.products:,} products x {len(days)} daily runs, {args.change_rate:.0%} repriced per day")
+    print(f"   upsert per run:              {upsert_time * 1000:8.1f} ms  ({rows:,} price rows stored, "
+          f"{rows / (args.products * len(days)):.1%} of one row per product per day)")
+    print(f"   year-over-year, one CPI item: {query_time * 1000:8.1f} ms  ({len(yoy)} products)")
+    print(f"   loading every dated xlsx (extrapolated): {xlsx_time:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from rapidfuzz import fuzz
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "Quickmart", "Scripts"))
+from basket_items import load_cpi_items
+from cpi_matcher import MATCH_THRESHOLD, CPIMatcher, MatchCache, clean_text
+
+BASKET = os.path.join(ROOT, "CPI basket.xlsx")
+BRANDS = ["Brookside", "Kensalt", "Pembe", "Menengai", "Dettol", "Ketepa", "Exe", "Tuzo", "Daawat", "Soko"]
+FILLERS = ["Premium", "Classic", "Family", "Value", "Original", "Fresh", "Lemon", "Vanilla", "Packet", "Refill"]
+
+
+def synthetic_products(cpi_items, count, seed=0):
+    """Brand plus a mix of basket words and filler words, like a supermarket catalogue"""
+    rng = random.Random(seed)
+    words = sorted({word for item in cpi_items for word in clean_text(item).split() if word.isalpha()})
+    names = []
+    for _ in range(count):
+        parts = [rng.choice(words if rng.random() < 0.5 else FILLERS) for _ in range(rng.randint(1, 4))]
+        names.append(" ".join([rng.choice(BRANDS)] + parts).title())
+    return pd.Series(names)
+
+
+def loop_match(product_name, cpi_items, threshold=MATCH_THRESHOLD):
+    """The previous approach: clean and score every basket item, once to filter and again to pick"""
+    cleaned_product = clean_text(product_name)
+    if not any(fuzz.token_set_ratio(cleaned_product, clean_text(item)) >= threshold for item in cpi_items):
+        return None
+    scores = [(item, fuzz.token_set_ratio(cleaned_product, clean_text(item))) for item in cpi_items]
+    return max((match for match in scores if match[1] >= threshold), key=lambda x: x[1])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPI basket matching timings on synthetic product names")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes for the parallel run")
+    parser.add_argument("--loop-rows", type=int, default=500, help="rows timed with the old loop (it is slow)")
+    args = parser.parse_args()
+
+    cpi_items = load_cpi_items(BASKET)
+    products = synthetic_products(cpi_items, args.rows)
+    matcher = CPIMatcher(cpi_items)
+
+    start = time.perf_counter()
+    products.head(args.loop_rows).apply(loop_match, cpi_items=cpi_items)
+    loop_time = (time.perf_counter() - start) / min(args.loop_rows, args.rows) * args.rows
+
+    start = time.perf_counter()
+    indexed = matcher.match(products)
+    indexed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = matcher.match(products, workers=args.workers)
+    parallel_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exhaustive = matcher.match_exhaustive(products)
+    exhaustive_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "cache.sqlite")
+        with MatchCache(cache_file, matcher.fingerprint) as cache:
+            matcher.match(products, cache=cache)  # First day fills the cache
+        with MatchCache(cache_file, matcher.fingerprint) as cache:
+            start = time.perf_counter()
+            matcher.match(products, cache=cache)
+            cached_time = time.perf_counter() - start
+
+    agreement = (indexed["matched_item"].fillna("") == exhaustive["matched_item"].fillna("")).mean()
+    print(f"{args.rows:,} products against {len(cpi_items)} CPI items")
+    print(f"   nested loop (extrapolated):  {loop_time:7.2f} s")
+    print(f"   exhaustive cdist:            {exhaustive_time:7.2f} s  {loop_time / exhaustive_time:6.1f}x")
+    print(f"   indexed CPIMatcher.match:    {indexed_time:7.2f} s  {loop_time / indexed_time:6.1f}x  "
+          f"({agreement:.2%} same item as exhaustive)")
+    print(f"   indexed, {args.workers:>2} processes:     {parallel_time:7.2f} s  {loop_time / parallel_time:6.1f}x  "
+          f"({'identical' if parallel.equals(indexed) else 'DIFFERENT'} to serial)")
+    print(f"   indexed, warm match cache:   {cached_time:7.2f} s  {loop_time / cached_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "Quickmart", "Scripts"))
+from product_parser import available_backends, get_parser
+
+FIXTURE = os.path.join(ROOT, "debug_search_page.html")
+
+
+def time_backend(backend, html, iterations):
+    parser = get_parser(backend)
+    parser.parse(html)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        products = parser.parse(html)
+    elapsed = (time.perf_counter() - start) / iterations
+    return elapsed, products
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse+extract timings for Quickmart listing pages")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--fixture", default=FIXTURE)
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        html = f.read()
+
+    results = {backend: time_backend(backend, html, args.iterations) for backend in available_backends()}
+    baseline, reference = results["bs4"]
+
+    print(f"Fixture: {os.path.basename(args.fixture)} ({len(html) / 1024:.0f} KB, "
+          f"{len(reference)} products, {args.iterations} iterations)")
+    for backend, (elapsed, products) in results.items():
+        same = "identical" if products == reference else "DIFFERENT"
+        print(f"{backend:>11}: {elapsed * 1000:8.2f} ms/page  {baseline / elapsed:5.1f}x  ({same} output)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "Pamgolding", "Scripts"))
+from price_processor import process_frame
+
+AREAS = ["Westlands", "Kilimani", "Lavington", "Karen", "Runda", "Kileleshwa", "Upper Hill", "Nyali", "Muthaiga"]
+TYPES = ["1 Bedroom Apartment", "2 Bedroom Apartment", "3 Bedroom Townhouse", "Studio Apartment", "Penthouse"]
+
+
+def synthetic_listings(count, seed=0):
+    rng = random.Random(seed)
+    titles, prices = [], []
+    for _ in range(count):
+        titles.append(f"{rng.choice(TYPES)} to rent in {rng.choice(AREAS)} (Kenya)"
+                      if rng.random() < 0.95 else "Apartment to rent")
+        rand = f"R{rng.randint(5, 90) * 1000:,}"
+        prices.append(rng.choice([
+            f"{rand} (KSH{rng.randint(40, 600) * 1000:,})",
+            f"{rand} (${rng.randint(300, 5000):,})",
+            rand,
+            "Price on application",
+        ]))
+    return pd.DataFrame({"title": titles, "price": prices})
+
+
+def process_loop(df):
+    """The previous approach: iterrows with per-row regex calls and df.at writes"""
+    df = df.copy()
+    for column in ["Price_Rand", "Price_KSH", "Location", "Area", "Country"]:
+        df[column] = None
+    for idx, row in df.iterrows():
+        rand_match = re.search(r'R([\d,]+)', row['price'])
+        df.at[idx, 'Price_Rand'] = float(rand_match.group(1).replace(',', '')) if rand_match else None
+        ksh_match = re.search(r'KSH([\d,]+)', row['price'])
+        usd_match = re.search(r'\$\s*([\d,]+)', row['price'])
+        if ksh_match:
+            df.at[idx, 'Price_KSH'] = float(ksh_match.group(1).replace(',', ''))
+        elif usd_match:
+            df.at[idx, 'Price_KSH'] = float(usd_match.group(1).replace(',', '')) * 142.6
+        location_match = re.search(r'in\s+([^()]+)\s*\(([^)]+)\)$', row['title'])
+        if location_match:
+            area, country = location_match.group(1).strip(), location_match.group(2).strip()
+            df.at[idx, 'Location'] = f"{area}, {country}"
+            df.at[idx, 'Area'] = area
+            df.at[idx, 'Country'] = country
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pam Golding price/location processing timings")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--loop-rows", type=int, default=20_000, help="rows timed with the old loop (it is slow)")
+    args = parser.parse_args()
+
+    listings = synthetic_listings(args.rows)
+    sample = listings.head(args.loop_rows)
+
+    start = time.perf_counter()
+    looped = process_loop(sample)
+    loop_time = (time.perf_counter() - start) / len(sample) * len(listings)
+
+    start = time.perf_counter()
+    processed = process_frame(listings)
+    vectorized_time = time.perf_counter() - start
+
+    # The seed FX table has the old fixed USD rate, so converted prices should agree too
+    columns = ["Price_Rand", "Price_KSH", "Location", "Area", "Country"]
+    same = looped[columns].astype(object).fillna("").astype(str).equals(
+        processed.head(len(sample))[columns].astype(object).fillna("").astype(str))
+    print(f"{args.rows:,} synthetic listings")
+    print(f"   iterrows loop (extrapolated): {loop_time:7.2f} s")
+    print(f"   process_frame:                {vectorized_time:7.2f} s  {loop_time / vectorized_time:5.1f}x  "
+          f"({'identical' if same else 'DIFFERENT'} output)")
+
+
+if __name__ == "__main__":
+    main()
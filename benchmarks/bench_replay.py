@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "Quickmart", "Scripts"))
+from Common.engine import replay_adapter
+from Common.http_cache import ResponseCache
+from quickmart import QuickmartAdapter
+
+FIXTURE = os.path.join(ROOT, "debug_search_page.html")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay of cached Quickmart listing pages")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fixture", default=FIXTURE)
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        html = f.read()
+
+    adapter = QuickmartAdapter()
+    adapter.dedupe_fields = None  # Every cached page holds the same products
+    groups = [group for group, _ in adapter.start_urls()]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp)
+        start = time.perf_counter()
+        for i in range(args.pages):
+            group = groups[i % len(groups)]
+            page = i // len(groups) + 1
+            # A marker per page keeps every body distinct, as real pages are
+            cache.put(f"https://www.quickmart.co.ke/{group}?page={page}", f"{html}<!-- {i} -->",
+                      200, {}, adapter.source, group, page)
+        write_time = time.perf_counter() - start
+        stored = sum(os.path.getsize(os.path.join(folder, name))
+                     for folder, _, names in os.walk(tmp) for name in names)
+
+        start = time.perf_counter()
+        records = replay_adapter(adapter, cache=cache)
+        replay_time = time.perf_counter() - start
+
+    print(f"{args.pages:,} cached pages of {len(html) / 1024:.0f} KB ({stored / 1024 / 1024:.1f} MB on disk)")
+    print(f"   write-through: {write_time / args.pages * 1000:6.2f} ms/page")
+    print(f"   replay:        {replay_time:6.2f} s for {len(records):,} products, no network")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+from Common.storage import read_stage, write_stage
+
+CATEGORIES = ["Foods", "Fresh Produce", "Personal Care", "Household Items", "Home Care", "Electronics", "Textile"]
+WORDS = ["Brookside", "Milk", "Kensalt", "Salt", "Pembe", "Flour", "Dettol", "Soap", "Ketepa", "Tea", "Rice", "Oil"]
+
+
+def synthetic_products(count, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "category": [rng.choice(CATEGORIES) for _ in range(count)],
+        "name": [" ".join(rng.sample(WORDS, 3)) + f" {rng.randint(1, 20) * 50}g" for _ in range(count)],
+        "price": [f"KSh {rng.randint(50, 3000):,}.00" for _ in range(count)],
+        "url": [f"https://www.quickmart.co.ke/foods?page={rng.randint(1, 150)}" for _ in range(count)],
+    })
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stage hand-off timings: xlsx vs partitioned Parquet")
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = synthetic_products(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = os.path.join(tmp, "raw.xlsx")
+        xlsx_write, _ = timed(lambda: df.to_excel(xlsx, index=False))
+        xlsx_read, _ = timed(lambda: pd.read_excel(xlsx))
+
+        parquet_write, _ = timed(lambda: write_stage(df, "raw", "quickmart", partition_by=("category",), root=tmp))
+        parquet_read, _ = timed(lambda: read_stage("raw", "quickmart", root=tmp))
+        pruned_read, pruned = timed(lambda: read_stage("raw", "quickmart", columns=["category", "name"], root=tmp))
+        one_category, _ = timed(lambda: read_stage("raw", "quickmart", filters={"category": "Foods"}, root=tmp))
+
+    print(f"{args.rows:,} products, {len(df.columns)} columns")
+    print(f"   xlsx    write: {xlsx_write:6.2f} s   read: {xlsx_read:6.2f} s")
+    print(f"   parquet write: {parquet_write:6.2f} s   read: {parquet_read:6.2f} s  "
+          f"({(xlsx_write + xlsx_read) / (parquet_write + parquet_read):.0f}x faster round trip)")
+    print(f"   parquet read of 2 columns: {pruned_read:6.3f} s, of one category: {one_category:6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+for folder in (("Quickmart", "Scripts"), ("Pamgolding", "Scripts"), ("Property_ke",), ("Buyrent",)):
+    sys.path.append(os.path.join(ROOT, *folder))
+
+FIXTURE = os.path.join(ROOT, "debug_search_page.html")
+BASKET = os.path.join(ROOT, "CPI basket.xlsx")
+QUICKMART_URL = "https://www.quickmart.co.ke/foods"
+AREAS = ["Westlands", "Kilimani", "Lavington", "Karen", "Runda", "Kileleshwa", "Upper Hill", "Nyali"]
+
+
+# ======================
+# SYNTHETIC PAGES
+# ======================
+# Each page carries only the markup the site's extractor reads, with the
+# same classes and attributes as the live site.
+def quickmart_page(names, rng):
+    return "<html><body>" + "".join(
+        f'<div class="products productInfoJs"><div class="products-title">{name}</div>'
+        f'<div class="products-price-new">KSh {rng.randint(50, 3000):,}.00</div></div>'
+        for name in names) + "</body></html>"
+
+
+def buyrent_page(count, rng):
+    cards = []
+    for i in range(count):
+        area, beds = rng.choice(AREAS), rng.randint(1, 5)
+        cards.append(
+            '<div class="listing-card">'
+            f'<span class="text-lg font-semibold leading-6 text-black md:inline">{beds} Bedroom Apartment in {area}</span>'
+            f'<div class="flex items-center justify-center text-xl font-bold leading-7 text-grey-900">KSh {rng.randint(20, 400) * 1000:,}</div>'
+            f'<div class="flex max-w-full items-center"><p class="ml-1 truncate text-sm font-normal capitalize text-grey-650">{area}, Nairobi</p></div>'
+            f'<h5 class="text-md mb-3 hidden font-normal leading-8 md:block md:text-sm">Spacious {beds} bedroom unit with parking</h5>'
+            f'<span data-cy="card-bedroom_count">{beds}</span><span data-cy="card-bathroom_count">{max(1, beds - 1)}</span>'
+            '<div class="swiper-slide flex h-6 !w-auto items-center rounded-full bg-highlight px-2 py-1 text-sm font-normal leading-4 text-grey-550">Parking</div>'
+            f'<a data-cy="listing-information-link" href="/listings/{beds}-bedroom-apartment-for-rent-{area.lower().replace(" ", "-")}-{i}">View</a>'
+            f'<a data-cy="agency-logo" agency-slug="agency-{i % 40}"></a>'
+            '</div>')
+    return "<html><body>" + "".join(cards) + "</body></html>"
+
+
+def propertypro_page(count, rng):
+    return "<html><body>" + "".join(
+        f'<a href="/property/{i}"><div class="popular-block"><img src="/img/{i}.jpg">'
+        f'<h4>{rng.randint(1, 5)} bedroom apartment for rent</h4><h2>KSh {rng.randint(20, 400) * 1000:,}</h2>'
+        f'<p>{rng.choice(AREAS)}, Nairobi</p></div></a>'
+        for i in range(count)) + "</body></html>"
+
+
+def pamgolding_page(count, rng):
+    return "<html><body>" + "".join(
+        f'<div class="pgp-property-content"><a href="/property/{i}">'
+        f'<div class="pgp-description">{rng.randint(1, 4)} Bedroom Apartment to rent in {rng.choice(AREAS)} (Kenya)</div>'
+        f'<div class="pgp-price">R{rng.randint(5, 90) * 1000:,} (KSH{rng.randint(40, 600) * 1000:,})</div></a>'
+        f'<div class="pgp-details">Modern apartment close to shops and schools</div>'
+        f'<div class="pgp-features"><div><i class="icon-bedroom"></i> {rng.randint(1, 4)}</div>'
+        f'<div><i class="icon-bath"></i> {rng.randint(1, 3)}</div><div><i class="icon-parking"></i> 1</div></div>'
+        '</div>'
+        for i in range(count)) + "</body></html>"
+
+
+# ======================
+# CASES
+# ======================
+# Each case returns (function to time, number of items it processes). Imports
+# happen inside so a site whose dependencies are missing is reported, not fatal.
+# quickmart.py's HTML extractor: what QuickmartAdapter runs on each page
+# with EXTRACT_IN_BROWSER off, and on every cached page when replaying
+def case_quickmart_fixture(args, rng):
+    from quickmart import extract_products
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    return (lambda: extract_products(html, "Foods", QUICKMART_URL),
+            len(extract_products(html, "Foods", QUICKMART_URL)))
+
+
+def case_quickmart_synthetic(args, rng):
+    from bench_categorize import synthetic_names
+    from quickmart import extract_products
+    html = quickmart_page(synthetic_names(args.listings), rng)
+    return lambda: extract_products(html, "Foods", QUICKMART_URL), args.listings
+
+
+def case_buyrent(args, rng):
+    from buyrent import parse_listings
+    html = buyrent_page(args.listings, rng)
+    return lambda: parse_listings(html), args.listings
+
+
+def case_propertypro(args, rng):
+    from propertyke import PropertyProAdapter
+    adapter, html = PropertyProAdapter(), propertypro_page(args.listings, rng)
+    return lambda: adapter.extract_records(html, "Property for rent", "https://www.propertypro.co.ke"), args.listings
+
+
+def case_pamgolding(args, rng):
+    from pamgolding import parse_listings_html
+    html = pamgolding_page(args.listings, rng)
+    return lambda: parse_listings_html(html), args.listings
+
+
+def case_categorize(args, rng):
+    from bench_categorize import synthetic_names
+    from categorize import CategoryClassifier, extract_product_details
+    names, classifier = synthetic_names(args.rows), CategoryClassifier()
+
+    def run():
+        extract_product_details(names)
+        classifier.classify(names)
+    return run, args.rows
+
+
+def case_basket_items(args, rng):
+    from basket_items import load_cpi_items
+    from bench_matcher import synthetic_products
+    from cpi_matcher import CPIMatcher
+    cpi_items = load_cpi_items(BASKET)
+    products = synthetic_products(cpi_items, args.match_rows)
+    # A fresh matcher each time, so no work is reused between repeats
+    return lambda: CPIMatcher(cpi_items).match(products), args.match_rows
+
+
+def case_price_processor(args, rng):
+    from bench_price_processor import synthetic_listings
+    from price_processor import process_frame
+    listings = synthetic_listings(args.rows)
+    return lambda: process_frame(listings), args.rows
+
+
+CASES = {
+    "extract.quickmart.fixture": case_quickmart_fixture,
+    "extract.quickmart.synthetic": case_quickmart_synthetic,
+    "extract.buyrent": case_buyrent,
+    "extract.propertypro": case_propertypro,
+    "extract.pamgolding": case_pamgolding,
+    "process.categorize": case_categorize,
+    "process.basket_items": case_basket_items,
+    "process.price_processor": case_price_processor,
+}
+
+
+def run_case(name, setup, args):
+    try:
+        func, items = setup(args, random.Random(args.seed))
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    except Exception as e:
+        return {"name": name, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    best = min(times)
+    return {
+        "name": name, "status": "ok", "items": items, "repeat": args.repeat,
+        "seconds": round(best, 6), "median_seconds": round(sorted(times)[len(times) // 2], 6),
+        "per_item_us": round(best / items * 1e6, 3) if items else None,
+        "items_per_second": round(items / best, 1) if best else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, tolerance):
+    """Per-case slowdown against a previous report; returns the names that regressed"""
+    previous = {r["name"]: r for r in baseline["results"] if r.get("status") == "ok"}
+    regressed = []
+    for result in report["results"]:
+        old = previous.get(result["name"])
+        if result.get("status") != "ok" or old is None or not old.get("per_item_us"):
+            continue
+        ratio = result["per_item_us"] / old["per_item_us"]
+        result["baseline_per_item_us"] = old["per_item_us"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressed.append(result["name"])
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline timings of every site's extraction and the processing stages")
+    parser.add_argument("--listings", type=int, default=2_000, help="listings on each synthetic page")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows for categorize and price processing")
+    parser.add_argument("--match-rows", type=int, default=5_000, help="product names matched to the CPI basket")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="run cases whose name starts with a prefix")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed per-item slowdown vs the baseline")
+    args = parser.parse_args()
+
+    cases = {name: setup for name, setup in CASES.items()
+             if not args.only or any(name.startswith(prefix) for prefix in args.only)}
+    results = []
+    for name, setup in cases.items():
+        result = run_case(name, setup, args)
+        results.append(result)
+        # Progress goes to stderr so stdout stays valid JSON
+        if result["status"] == "ok":
+            print(f"{name:<30} {result['seconds']:8.3f} s  {result['per_item_us']:10.2f} µs/item", file=sys.stderr)
+        else:
+            print(f"{name:<30} skipped ({result['error']})", file=sys.stderr)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {"listings": args.listings, "rows": args.rows, "match_rows": args.match_rows,
+                       "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressed = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressed
+        for name in regressed:
+            print(f"⚠️ {name} is slower than the baseline beyond {args.tolerance:.0%}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()